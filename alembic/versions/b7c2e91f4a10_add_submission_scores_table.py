@@ -0,0 +1,46 @@
+"""add submission_scores table for asynchronous scoring
+
+Revision ID: b7c2e91f4a10
+Revises: 0a5b9635fbeb
+Create Date: 2026-10-18 10:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2e91f4a10'
+down_revision: Union[str, None] = '0a5b9635fbeb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('submission_scores',
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('question_set_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('total_score', sa.Integer(), nullable=True),
+    sa.Column('max_score', sa.Integer(), nullable=True),
+    sa.Column('percentage', sa.Float(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('queued_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('scored_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['question_set_id'], ['question_sets.id'], ),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('submission_id')
+    )
+    op.create_index(op.f('ix_submission_scores_question_set_id'), 'submission_scores', ['question_set_id'], unique=False)
+    op.create_index(op.f('ix_submission_scores_status'), 'submission_scores', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_submission_scores_status'), table_name='submission_scores')
+    op.drop_index(op.f('ix_submission_scores_question_set_id'), table_name='submission_scores')
+    op.drop_table('submission_scores')
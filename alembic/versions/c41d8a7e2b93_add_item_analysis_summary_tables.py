@@ -0,0 +1,51 @@
+"""add option_distributions and question_item_stats summary tables
+
+Revision ID: c41d8a7e2b93
+Revises: b7c2e91f4a10
+Create Date: 2026-10-18 11:26:47.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8a7e2b93'
+down_revision: Union[str, None] = 'b7c2e91f4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('option_distributions',
+    sa.Column('question_set_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('option_id', sa.Integer(), nullable=False),
+    sa.Column('response_count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['option_id'], ['options.id'], ),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.ForeignKeyConstraint(['question_set_id'], ['question_sets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('question_set_id', 'question_id', 'option_id')
+    )
+    op.create_table('question_item_stats',
+    sa.Column('question_set_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('n', sa.BigInteger(), nullable=False),
+    sa.Column('sum_item', sa.BigInteger(), nullable=False),
+    sa.Column('sum_item_sq', sa.BigInteger(), nullable=False),
+    sa.Column('sum_total', sa.BigInteger(), nullable=False),
+    sa.Column('sum_total_sq', sa.BigInteger(), nullable=False),
+    sa.Column('sum_item_total', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.ForeignKeyConstraint(['question_set_id'], ['question_sets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('question_set_id', 'question_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('question_item_stats')
+    op.drop_table('option_distributions')
@@ -0,0 +1,59 @@
+"""add composite filter indexes and one-active-per-parent unique indexes
+
+Revision ID: d5e3f1a96c07
+Revises: c41d8a7e2b93
+Create Date: 2026-10-18 12:14:05.337861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e3f1a96c07'
+down_revision: Union[str, None] = 'c41d8a7e2b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, parent column) pairs that may have at most one active row per parent
+ONE_ACTIVE = [
+    ('assessments', 'type_id'),
+    ('question_sets', 'assessment_id'),
+    ('option_sets', 'question_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_assessments_type_id_is_active', 'assessments', ['type_id', 'is_active'], unique=False)
+    op.create_index('ix_question_sets_assessment_id_is_active', 'question_sets', ['assessment_id', 'is_active'], unique=False)
+    op.create_index('ix_option_sets_question_id_is_active', 'option_sets', ['question_id', 'is_active'], unique=False)
+    op.create_index('ix_responses_submission_id', 'responses', ['submission_id'], unique=False)
+    op.create_index('ix_responses_question_id_option_id', 'responses', ['question_id', 'option_id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    for table, parent in ONE_ACTIVE:
+        name = f'uq_{table}_one_active'
+        if dialect == 'mysql':
+            # Functional key part (MySQL 8.0.13+): inactive rows index as NULL and never collide
+            op.execute(f'CREATE UNIQUE INDEX {name} ON {table} ((IF(is_active, {parent}, NULL)))')
+        else:
+            op.create_index(
+                name, table, [parent], unique=True,
+                postgresql_where=sa.text('is_active'),
+                sqlite_where=sa.text('is_active = 1'),
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _ in reversed(ONE_ACTIVE):
+        op.drop_index(f'uq_{table}_one_active', table_name=table)
+
+    op.drop_index('ix_responses_question_id_option_id', table_name='responses')
+    op.drop_index('ix_responses_submission_id', table_name='responses')
+    op.drop_index('ix_option_sets_question_id_is_active', table_name='option_sets')
+    op.drop_index('ix_question_sets_assessment_id_is_active', table_name='question_sets')
+    op.drop_index('ix_assessments_type_id_is_active', table_name='assessments')
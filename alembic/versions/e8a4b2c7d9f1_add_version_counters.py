@@ -0,0 +1,47 @@
+"""add version_counters and unique question set versions per assessment
+
+Revision ID: e8a4b2c7d9f1
+Revises: d5e3f1a96c07
+Create Date: 2026-10-18 13:02:39.118350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a4b2c7d9f1'
+down_revision: Union[str, None] = 'd5e3f1a96c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('version_counters',
+    sa.Column('scope', sa.String(length=32), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'parent_id')
+    )
+    # Start every counter at the highest version already stored
+    op.execute(
+        "INSERT INTO version_counters (scope, parent_id, value) "
+        "SELECT 'assessment', type_id, MAX(version) FROM assessments GROUP BY type_id"
+    )
+    op.execute(
+        "INSERT INTO version_counters (scope, parent_id, value) "
+        "SELECT 'question_set', assessment_id, MAX(version) FROM question_sets GROUP BY assessment_id"
+    )
+    # Fails if earlier racing creates already duplicated a version; renumber those first
+    with op.batch_alter_table('question_sets') as batch_op:
+        batch_op.create_unique_constraint('uq_question_set_assessment_version', ['assessment_id', 'version'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('question_sets') as batch_op:
+        batch_op.drop_constraint('uq_question_set_assessment_version', type_='unique')
+    op.drop_table('version_counters')
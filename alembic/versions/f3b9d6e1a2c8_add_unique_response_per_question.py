@@ -0,0 +1,41 @@
+"""add unique response per submission and question
+
+Revision ID: f3b9d6e1a2c8
+Revises: e8a4b2c7d9f1
+Create Date: 2026-10-18 15:21:07.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d6e1a2c8'
+down_revision: Union[str, None] = 'e8a4b2c7d9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the newest answer per (submission, question); the derived table lets
+    # MySQL read the table it deletes from. Rebuild the item analysis afterwards
+    # (python -m app.item_analysis rebuild --all) if anything was removed.
+    op.execute(
+        "DELETE FROM responses WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM responses "
+        "GROUP BY submission_id, question_id) AS keep)"
+    )
+    with op.batch_alter_table('responses') as batch_op:
+        batch_op.create_unique_constraint('uq_response_submission_question', ['submission_id', 'question_id'])
+        # Covered by the unique key's leading column (which also backs the FK on MySQL)
+        batch_op.drop_index('ix_responses_submission_id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('responses') as batch_op:
+        batch_op.create_index('ix_responses_submission_id', ['submission_id'], unique=False)
+        batch_op.drop_constraint('uq_response_submission_question', type_='unique')
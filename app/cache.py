@@ -0,0 +1,180 @@
+# app/cache.py
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Namespaces of the "active pointer" lookups
+ACTIVE_ASSESSMENT_BY_TYPE = "active_assessment_by_type"
+ACTIVE_QUESTION_SET_BY_ASSESSMENT = "active_question_set_by_assessment"
+ACTIVE_OPTION_SET_BY_QUESTION = "active_option_set_by_question"
+# OptionSet id -> newest OptionSet in its parent_id lineage
+LATEST_OPTION_SET_DESCENDANT = "latest_option_set_descendant"
+# QuestionSet id -> content version of its snapshot (None unless the set is active)
+SNAPSHOT_VERSION = "snapshot_version"
+
+
+class ActivePointerCache:
+    """
+    In-process LRU cache with a TTL for small, rarely-changing lookups such as
+    "which Assessment is active for this type".
+
+    Values are plain ids (never ORM instances, which belong to one Session).
+    ``None`` results are cached too, so "no active version" does not hit the
+    database either. Writers call :meth:`invalidate` after committing; when a
+    Redis URL is attached the invalidation is also published so other worker
+    processes drop their copy. The TTL bounds staleness if a message is lost.
+    A load that overlaps an invalidation of its namespace is returned but not
+    cached, so an invalidation can't be undone by a slow reader.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        # None: take ACTIVE_CACHE_* from the settings on first use, not at import
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, float]]" = OrderedDict()
+        # Bumped by every invalidation of a namespace (and by clear()): a load that
+        # started before an invalidation must not store what it read
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._node_id = uuid.uuid4().hex
+        self._redis = None
+        self._channel: Optional[str] = None
+        self._listener = None
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is None:
+            self._max_entries = get_settings().active_cache_max_entries
+        return self._max_entries
+
+    @max_entries.setter
+    def max_entries(self, value: int) -> None:
+        self._max_entries = value
+
+    @property
+    def ttl_seconds(self) -> float:
+        if self._ttl_seconds is None:
+            self._ttl_seconds = get_settings().active_cache_ttl_seconds
+        return self._ttl_seconds
+
+    @ttl_seconds.setter
+    def ttl_seconds(self, value: float) -> None:
+        self._ttl_seconds = value
+
+    # ─── Lookups ─────────────────────────────────────────────
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        cache_key = (namespace, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = (self._epoch, self._generations.get(namespace, 0))
+
+        value = loader()
+
+        with self._lock:
+            if generation != (self._epoch, self._generations.get(namespace, 0)):
+                return value  # invalidated mid-load: serve it once, don't cache it
+            self._entries[cache_key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    # ─── Invalidation ────────────────────────────────────────
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None, publish: bool = True) -> None:
+        """Drop one key, or the whole namespace when ``key`` is None."""
+        self._drop(namespace, key)
+        if publish and self._redis is not None:
+            message = json.dumps({"origin": self._node_id, "namespace": namespace, "key": key})
+            try:
+                self._redis.publish(self._channel, message)
+            except Exception:  # a broken broker must not fail the write path
+                logger.warning("Could not publish cache invalidation", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def _drop(self, namespace: str, key: Optional[Hashable]) -> None:
+        with self._lock:
+            self.invalidations += 1
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cache_key]
+
+    # ─── Redis pub/sub fan-out ───────────────────────────────
+
+    def attach_redis(self, redis_url: str, channel: str) -> None:
+        """Publish invalidations to ``channel`` and apply the ones other workers publish."""
+        import redis
+
+        self.detach_redis()
+        self._redis = redis.Redis.from_url(redis_url)
+        self._channel = channel
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: self._on_message})
+        self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def detach_redis(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._redis = None
+        self._channel = None
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        try:
+            payload = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") == self._node_id:
+            return
+        key = payload.get("key")
+        self._drop(payload["namespace"], tuple(key) if isinstance(key, list) else key)
+
+    # ─── Metrics ─────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "redis": self._channel is not None,
+            }
+
+
+active_cache = ActivePointerCache()
+
+
+def start_cache_invalidation_listener() -> None:
+    """Hook Redis fan-out into the shared cache if REDIS_URL is configured (call on startup)."""
+    settings = get_settings()
+    if settings.redis_url:
+        active_cache.attach_redis(settings.redis_url, settings.active_cache_channel)
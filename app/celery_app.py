@@ -0,0 +1,38 @@
+# app/celery_app.py
+from celery import Celery
+
+from app.config import get_settings
+
+celery_app = Celery("vils", include=["app.tasks"])
+
+def _settings_config() -> dict:
+    # Evaluated when the Celery config is first read, so importing this
+    # module doesn't parse the environment
+    settings = get_settings()
+    return {
+        "broker_url": settings.celery_broker_url,
+        "result_backend": settings.celery_result_backend,
+        # SCORING_MODE=eager runs tasks inline (no broker needed, e.g. tests and scripts)
+        "task_always_eager": settings.scoring_mode == "eager",
+        # Run with `celery -A app.celery_app beat`: requeues pending scores whose dispatch was lost
+        "beat_schedule": {
+            "requeue-stale-scores": {
+                "task": "scoring.requeue_stale_scores",
+                "schedule": settings.scoring_sweep_interval_seconds,
+            },
+        },
+    }
+
+celery_app.add_defaults(_settings_config)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    # A task is only acknowledged once it finished, so a worker crash re-delivers it;
+    # scoring tasks are idempotent, which makes the re-run safe
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_eager_propagates=True,
+)
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import AnyUrl, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,5 +12,65 @@ class Settings(BaseSettings):
 
     db_url: AnyUrl = Field(..., alias="DB_URL")
 
-settings = Settings()  # type: ignore
+    # Async engine: DB_ASYNC enables it; the URL defaults to DB_URL with its
+    # driver swapped for the asyncio one (aiomysql / aiosqlite)
+    db_async: bool = Field(False, alias="DB_ASYNC")
+    db_async_url: Optional[str] = Field(None, alias="DB_ASYNC_URL")
+
+    # Read replicas (comma-separated URLs): sync sessions read from them, round-robin,
+    # and go back to the primary for writes and for a while after a caller's own commit
+    db_replica_urls: str = Field("", alias="DB_REPLICA_URLS")
+    db_replica_retry_seconds: float = Field(10.0, alias="DB_REPLICA_RETRY_SECONDS")     # re-probe a down replica
+    db_read_your_writes_seconds: float = Field(5.0, alias="DB_READ_YOUR_WRITES_SECONDS")  # >= replica lag
+
+    # Connection pool (applies to the sync and the async engine)
+    db_echo: bool = Field(False, alias="DB_ECHO")                     # log every statement
+    db_pool_size: int = Field(10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, alias="DB_POOL_TIMEOUT")     # seconds to wait for a connection
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")       # below MySQL wait_timeout
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+
+    # Redis is optional; when set, cache invalidations are fanned out over pub/sub
+    redis_url: Optional[str] = Field(None, alias="REDIS_URL")
+
+    # "Active pointer" cache (active Assessment / QuestionSet / OptionSet ids)
+    active_cache_max_entries: int = Field(4096, alias="ACTIVE_CACHE_MAX_ENTRIES")
+    active_cache_ttl_seconds: float = Field(60.0, alias="ACTIVE_CACHE_TTL_SECONDS")
+    active_cache_channel: str = Field("vils:active-cache", alias="ACTIVE_CACHE_CHANNEL")
+
+    # Published exam snapshots (local LRU, shared through Redis when REDIS_URL is set)
+    snapshot_cache_max_entries: int = Field(256, alias="SNAPSHOT_CACHE_MAX_ENTRIES")
+    snapshot_redis_prefix: str = Field("vils:snapshot", alias="SNAPSHOT_REDIS_PREFIX")
+    snapshot_max_age_seconds: int = Field(300, alias="SNAPSHOT_MAX_AGE_SECONDS")
+    snapshot_redis_ttl_seconds: int = Field(86400, alias="SNAPSHOT_REDIS_TTL_SECONDS")  # superseded versions expire
+
+    # Password hashing: bcrypt cost, and worker processes for off-loop hashing (0 = one per CPU)
+    bcrypt_rounds: int = Field(12, alias="BCRYPT_ROUNDS")
+    password_hash_workers: int = Field(0, alias="PASSWORD_HASH_WORKERS")
+
+    # Celery / asynchronous scoring
+    celery_broker_url: Optional[str] = Field(None, alias="CELERY_BROKER_URL")
+    celery_result_backend: Optional[str] = Field(None, alias="CELERY_RESULT_BACKEND")
+    # "celery": enqueue to the broker; "eager": score inline; "thread": score on a local thread pool
+    scoring_mode: Literal["celery", "eager", "thread"] = Field("celery", alias="SCORING_MODE")
+    scoring_batch_size: int = Field(500, alias="SCORING_BATCH_SIZE")      # submissions per task
+    scoring_threads: int = Field(4, alias="SCORING_THREADS")
+    # Pending scores older than this are re-dispatched by the beat sweeper, every interval
+    scoring_stale_seconds: float = Field(600.0, alias="SCORING_STALE_SECONDS")
+    scoring_sweep_interval_seconds: float = Field(300.0, alias="SCORING_SWEEP_INTERVAL_SECONDS")
+
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """Parse the environment / .env on first use rather than at import."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()  # type: ignore
+    return _settings
 
+def __getattr__(name: str):
+    # `from app.config import settings` keeps working, it just parses on first access
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,138 @@
+"""
+Async counterparts of the app.crud functions.
+
+Each function takes an ``AsyncSession`` and runs the sync crud function of the
+same name through ``AsyncSession.run_sync``: the ORM code runs unchanged inside
+a greenlet while every database round trip is awaited on the event loop, so a
+request waiting on MySQL no longer holds a threadpool worker.
+
+Objects come back attached to the AsyncSession. Relationships that were not
+loaded by the crud call cannot lazy-load afterwards; serialize them inside
+:func:`run` (or eager-load them) instead.
+"""
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import password_verification
+from app.crud import (
+    assessment,
+    assessment_tree,
+    assessment_type,
+    option,
+    option_set,
+    question,
+    question_set,
+    submission,
+    user,
+    user_group,
+)
+
+T = TypeVar("T")
+
+
+async def run(db: AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run any sync ``fn(session, *args, **kwargs)`` against ``db``."""
+    return await db.run_sync(fn, *args, **kwargs)
+
+
+def _async(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    @wraps(fn)
+    async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> T:
+        return await db.run_sync(fn, *args, **kwargs)
+    return wrapper
+
+
+# ─── Assessment types ────────────────────────────────────────
+create_assessment_type = _async(assessment_type.create_assessment_type)
+get_assessment_type = _async(assessment_type.get_assessment_type)
+get_assessment_types = _async(assessment_type.get_assessment_types)
+get_assessment_types_page = _async(assessment_type.get_assessment_types_page)
+
+# ─── Assessments ─────────────────────────────────────────────
+create_assessment = _async(assessment.create_assessment)
+get_assessment = _async(assessment.get_assessment)
+get_assessments = _async(assessment.get_assessments)
+get_assessments_page = _async(assessment.get_assessments_page)
+activate_assessment = _async(assessment.activate_assessment)
+get_active_assessment_id_by_type = _async(assessment.get_active_assessment_id_by_type)
+get_active_assessment_by_type = _async(assessment.get_active_assessment_by_type)
+
+load_assessment_tree = _async(assessment_tree.load_assessment_tree)
+load_question_set_tree = _async(assessment_tree.load_question_set_tree)
+
+# ─── Questions / question sets ───────────────────────────────
+create_question = _async(question.create_question)
+get_question = _async(question.get_question)
+get_questions = _async(question.get_questions)
+get_questions_page = _async(question.get_questions_page)
+get_questions_by_question_set = _async(question.get_questions_by_question_set)
+
+create_question_set = _async(question_set.create_question_set)
+derive_question_set = _async(question_set.derive_question_set)
+get_question_set = _async(question_set.get_question_set)
+get_question_sets_by_assessment = _async(question_set.get_question_sets_by_assessment)
+get_question_sets_by_assessment_page = _async(question_set.get_question_sets_by_assessment_page)
+get_active_question_set_id_by_assessment = _async(question_set.get_active_question_set_id_by_assessment)
+get_active_question_set_by_assessment = _async(question_set.get_active_question_set_by_assessment)
+activate_question_set = _async(question_set.activate_question_set)
+
+# ─── Options / option sets ───────────────────────────────────
+get_option = _async(option.get_option)
+get_options = _async(option.get_options)
+get_options_page = _async(option.get_options_page)
+create_option = _async(option.create_option)
+update_option = _async(option.update_option)
+delete_option = _async(option.delete_option)
+
+get_option_set = _async(option_set.get_option_set)
+get_option_sets = _async(option_set.get_option_sets)
+get_option_sets_page = _async(option_set.get_option_sets_page)
+get_option_sets_by_question_page = _async(option_set.get_option_sets_by_question_page)
+get_active_option_set_id_by_question = _async(option_set.get_active_option_set_id_by_question)
+get_active_option_set_by_question = _async(option_set.get_active_option_set_by_question)
+create_option_set = _async(option_set.create_option_set)
+bulk_create_option_sets = _async(option_set.bulk_create_option_sets)
+update_option_set = _async(option_set.update_option_set)
+delete_option_set = _async(option_set.delete_option_set)
+get_option_set_ancestors = _async(option_set.get_option_set_ancestors)
+get_option_set_descendants = _async(option_set.get_option_set_descendants)
+get_latest_descendant_id = _async(option_set.get_latest_descendant_id)
+get_latest_descendant = _async(option_set.get_latest_descendant)
+diff_option_sets = _async(option_set.diff_option_sets)
+
+# ─── Users / groups ──────────────────────────────────────────
+async def create_user(db: AsyncSession, obj_in):
+    # bcrypt runs in the hashing process pool, not on the event loop
+    hashed = await password_verification.hash_password_async(obj_in.password)
+    return await db.run_sync(user.create_user, obj_in, hashed_password=hashed)
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    db_user = await db.run_sync(user.get_user_by_email, email)
+    if db_user is None:
+        await password_verification.dummy_verify_async()
+        return None
+    ok, new_hash = await password_verification.verify_and_update_async(password, db_user.hashed_password)
+    if not ok:
+        return None
+    if new_hash:
+        await db.run_sync(user.set_user_password_hash, db_user, new_hash)
+    return db_user
+
+get_user = _async(user.get_user)
+get_users = _async(user.get_users)
+get_users_page = _async(user.get_users_page)
+get_user_by_email = _async(user.get_user_by_email)
+
+get_user_group = _async(user_group.get_user_group)
+get_user_groups = _async(user_group.get_user_groups)
+get_user_groups_page = _async(user_group.get_user_groups_page)
+create_user_group = _async(user_group.create_user_group)
+update_user_group = _async(user_group.update_user_group)
+delete_user_group = _async(user_group.delete_user_group)
+
+# ─── Submissions ─────────────────────────────────────────────
+bulk_create_submissions = _async(submission.bulk_create_submissions)
+upsert_responses = _async(submission.upsert_responses)
+get_responses_page = _async(submission.get_responses_page)
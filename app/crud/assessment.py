@@ -1,18 +1,15 @@
 from sqlalchemy.orm import Session
-from models import Assessment
-from schemas import AssessmentCreate
+from app.cache import ACTIVE_ASSESSMENT_BY_TYPE, active_cache
+from app.crud.version_counter import ASSESSMENT_VERSIONS, allocate_version
+from app.db_routing import primary_reads
+from app.models import Assessment
+from app.pagination import Page, paginate
+from app.schemas import AssessmentCreate
 from typing import List, Optional
 
 def create_assessment(db: Session, assessment: AssessmentCreate):
-    # Get latest version for this type_id
-    last_version = (
-        db.query(Assessment)
-          .filter(Assessment.type_id == assessment.type_id)
-          .order_by(Assessment.version.desc())
-          .first()
-    )
-
-    new_version = (last_version.version + 1) if last_version else 1
+    # Next version for this type_id, allocated atomically (safe under concurrent creates)
+    new_version = allocate_version(db, ASSESSMENT_VERSIONS, assessment.type_id)
 
     db_assessment = Assessment(
         title=assessment.title,
@@ -41,12 +38,17 @@ def get_assessment(db: Session, assessment_id: int) -> Optional[Assessment]:
 def get_assessments(db: Session, skip: int = 0, limit: int = 100) -> List[Assessment]:
     return db.query(Assessment).offset(skip).limit(limit).all()
 
+def get_assessments_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[Assessment]:
+    return paginate(db.query(Assessment), (Assessment.id,), cursor, limit)
+
 # ─────────────────────────────────────────────────────────────
 # Activate assessment by ID (ensure only one active per type_id)
 # ─────────────────────────────────────────────────────────────
 
 def activate_assessment(db: Session, assessment_id: int) -> Optional[Assessment]:
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    # From the primary: a lagging replica may not have a just-created assessment
+    with primary_reads(db):
+        assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
     if not assessment:
         return None
 
@@ -61,7 +63,9 @@ def activate_assessment(db: Session, assessment_id: int) -> Optional[Assessment]
 
     # Activate selected one
     assessment.is_active = True # type: ignore
+    type_id = assessment.type_id
     db.commit()
+    active_cache.invalidate(ACTIVE_ASSESSMENT_BY_TYPE, type_id)
     db.refresh(assessment)
     return assessment
 
@@ -70,11 +74,32 @@ def activate_assessment(db: Session, assessment_id: int) -> Optional[Assessment]
 # get active assessment by assessment type (ensure only one active per assesment type)
 # ─────────────────────────────────────────────────────────────
 
-def get_active_assessment_by_type(db: Session, type_id: int):
-    return (
-        db.query(Assessment)
-        .filter(Assessment.type_id == type_id, Assessment.is_active == True)
-        .first()
-    )
-
-
+def get_active_assessment_id_by_type(db: Session, type_id: int) -> Optional[int]:
+    # Served from the active-pointer cache; activate_assessment invalidates it.
+    # Loaded from the primary: a lagging replica would refill it with the old id.
+    def load() -> Optional[int]:
+        with primary_reads(db):
+            return (
+                db.query(Assessment.id)
+                .filter(Assessment.type_id == type_id, Assessment.is_active == True)
+                .scalar()
+            )
+
+    return active_cache.get_or_load(ACTIVE_ASSESSMENT_BY_TYPE, type_id, load)
+
+def get_active_assessment_by_type(db: Session, type_id: int) -> Optional[Assessment]:
+    assessment_id = get_active_assessment_id_by_type(db, type_id)
+    if assessment_id is None:
+        return None
+    with primary_reads(db):
+        # Primary-key get; free when the row is already in the session's identity map
+        assessment = db.get(Assessment, assessment_id)
+        if assessment is None or not assessment.is_active:
+            # Missed an invalidation (e.g. a lost pub/sub message): heal and re-resolve
+            active_cache.invalidate(ACTIVE_ASSESSMENT_BY_TYPE, type_id, publish=False)
+            return (
+                db.query(Assessment)
+                .filter(Assessment.type_id == type_id, Assessment.is_active == True)
+                .first()
+            )
+    return assessment
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.crud.question_set import get_active_question_set_id_by_assessment
+from app.models import Assessment, Option, OptionSet, Question, QuestionSet, question_set_questions
+
+# ─── Immutable exam tree ─────────────────────────────────────
+# Assessment -> active QuestionSet -> Questions -> active OptionSet -> Options
+
+@dataclass(frozen=True)
+class OptionNode:
+    id: int
+    text: str
+    score: int
+
+@dataclass(frozen=True)
+class OptionSetNode:
+    id: int
+    version: int
+    options: Tuple[OptionNode, ...]
+
+@dataclass(frozen=True)
+class QuestionNode:
+    id: int
+    text: str
+    max_score: int
+    option_set: Optional[OptionSetNode]  # None when the question has no active OptionSet
+
+@dataclass(frozen=True)
+class QuestionSetTree:
+    id: int
+    assessment_id: int
+    version: int
+    is_active: bool
+    questions: Tuple[QuestionNode, ...]
+
+@dataclass(frozen=True)
+class AssessmentTree:
+    id: int
+    title: str
+    description: Optional[str]
+    type_id: int
+    version: int
+    question_set: Optional[QuestionSetTree]  # None when no QuestionSet is active
+
+
+# ─── Loaders ─────────────────────────────────────────────────
+
+def load_question_set_tree(db: Session, question_set_id: int) -> Optional[QuestionSetTree]:
+    """
+    Load a QuestionSet with its questions, their active OptionSet and its
+    options in four SELECTs, whatever the number of questions.
+
+    Reads plain column rows, so nothing is loaded into (or overwritten in)
+    the identity map of ``db``.
+    """
+    qs = db.execute(
+        select(QuestionSet.id, QuestionSet.assessment_id, QuestionSet.version, QuestionSet.is_active)
+        .where(QuestionSet.id == question_set_id)
+    ).one_or_none()
+    if qs is None:
+        return None
+
+    questions = db.execute(
+        select(Question.id, Question.text, Question.max_score)
+        .join(question_set_questions, question_set_questions.c.question_id == Question.id)
+        .where(question_set_questions.c.question_set_id == question_set_id)
+        .order_by(Question.id)
+    ).all()
+
+    option_sets = {}
+    if questions:
+        option_sets = {
+            row.question_id: row
+            for row in db.execute(
+                select(OptionSet.id, OptionSet.version, OptionSet.question_id)
+                .where(OptionSet.question_id.in_([q.id for q in questions]), OptionSet.is_active == True)
+            )
+        }
+
+    options: Dict[int, List[OptionNode]] = defaultdict(list)
+    if option_sets:
+        for row in db.execute(
+            select(Option.id, Option.text, Option.score, Option.option_set_id)
+            .where(Option.option_set_id.in_([os.id for os in option_sets.values()]))
+            .order_by(Option.id)
+        ):
+            options[row.option_set_id].append(OptionNode(id=row.id, text=row.text, score=row.score))
+
+    def option_set_node(question_id: int) -> Optional[OptionSetNode]:
+        os = option_sets.get(question_id)
+        if os is None:
+            return None
+        return OptionSetNode(id=os.id, version=os.version, options=tuple(options[os.id]))
+
+    return QuestionSetTree(
+        id=qs.id,
+        assessment_id=qs.assessment_id,
+        version=qs.version,
+        is_active=qs.is_active,
+        questions=tuple(
+            QuestionNode(id=q.id, text=q.text, max_score=q.max_score, option_set=option_set_node(q.id))
+            for q in questions
+        ),
+    )
+
+def load_assessment_tree(db: Session, assessment_id: int) -> Optional[AssessmentTree]:
+    """The exam-render tree for an assessment: at most six SELECTs, fewer on cache hits."""
+    assessment = db.get(Assessment, assessment_id)
+    if assessment is None:
+        return None
+
+    qs_id = get_active_question_set_id_by_assessment(db, assessment_id)
+    return AssessmentTree(
+        id=assessment.id,
+        title=assessment.title,
+        description=assessment.description,
+        type_id=assessment.type_id,
+        version=assessment.version,
+        question_set=load_question_set_tree(db, qs_id) if qs_id is not None else None,
+    )
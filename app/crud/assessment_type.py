@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from models import AssessmentType
-from schemas import AssessmentTypeCreate, AssessmentTypeRead
+from app.models import AssessmentType
+from app.schemas import AssessmentTypeCreate, AssessmentTypeRead
+from app.pagination import Page, paginate
+from typing import Optional
 
 
 def create_assessment_type(db: Session, assessment_type: AssessmentTypeCreate):
@@ -17,3 +19,8 @@ def get_assessment_type(db: Session, assessment_type_id: int):
 
 def get_assessment_types(db: Session, skip: int = 0, limit: int = 100):
     return db.query(AssessmentType).offset(skip).limit(limit).all()
+
+
+def get_assessment_types_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[AssessmentType]:
+    return paginate(db.query(AssessmentType), (AssessmentType.id,), cursor, limit)
+
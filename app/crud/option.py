@@ -1,6 +1,8 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app import models, schemas
+from app.cache import SNAPSHOT_VERSION, active_cache
+from app.pagination import Page, paginate
 
 def get_option(db: Session, id: int) -> Optional[models.Option]:
     return db.query(models.Option).filter(models.Option.id == id).first()
@@ -8,6 +10,9 @@ def get_option(db: Session, id: int) -> Optional[models.Option]:
 def get_options(db: Session, skip: int = 0, limit: int = 100) -> List[models.Option]:
     return db.query(models.Option).offset(skip).limit(limit).all()
 
+def get_options_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[models.Option]:
+    return paginate(db.query(models.Option), (models.Option.id,), cursor, limit)
+
 def create_option(db: Session, obj_in: schemas.OptionCreate) -> models.Option:
     db_obj = models.Option(
         text=obj_in.text,
@@ -16,6 +21,7 @@ def create_option(db: Session, obj_in: schemas.OptionCreate) -> models.Option:
     )
     db.add(db_obj)
     db.commit()
+    active_cache.invalidate(SNAPSHOT_VERSION)  # the set may be published
     db.refresh(db_obj)
     return db_obj
 
@@ -23,9 +29,11 @@ def update_option(db: Session, db_obj: models.Option, obj_in: schemas.OptionCrea
     setattr(db_obj, "text", obj_in.text)
     setattr(db_obj, "score", obj_in.score)
     db.commit()
+    active_cache.invalidate(SNAPSHOT_VERSION)
     db.refresh(db_obj)
     return db_obj
 
 def delete_option(db: Session, db_obj: models.Option) -> None:
     db.delete(db_obj)
     db.commit()
+    active_cache.invalidate(SNAPSHOT_VERSION)
@@ -1,6 +1,11 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app import models, schemas
+from app.cache import ACTIVE_OPTION_SET_BY_QUESTION, LATEST_OPTION_SET_DESCENDANT, SNAPSHOT_VERSION, active_cache
+from app.db_routing import primary_reads
+from app.pagination import Page, paginate
 
 def get_option_set(db: Session, id: int) -> Optional[models.OptionSet]:
     return db.query(models.OptionSet).filter(models.OptionSet.id == id).first()
@@ -8,32 +13,269 @@ def get_option_set(db: Session, id: int) -> Optional[models.OptionSet]:
 def get_option_sets(db: Session, skip: int = 0, limit: int = 100) -> List[models.OptionSet]:
     return db.query(models.OptionSet).offset(skip).limit(limit).all()
 
+def get_option_sets_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[models.OptionSet]:
+    return paginate(db.query(models.OptionSet), (models.OptionSet.id,), cursor, limit)
+
+def get_option_sets_by_question_page(db: Session, question_id: int, cursor: Optional[str] = None, limit: int = 100) -> Page[models.OptionSet]:
+    # Newest version first
+    query = db.query(models.OptionSet).filter(models.OptionSet.question_id == question_id)
+    return paginate(query, (models.OptionSet.version, models.OptionSet.id), cursor, limit, descending=True)
+
+def get_active_option_set_id_by_question(db: Session, question_id: int) -> Optional[int]:
+    # Served from the active-pointer cache; writes that touch is_active invalidate it.
+    # Loaded from the primary: a lagging replica would refill it with the old id.
+    def load() -> Optional[int]:
+        with primary_reads(db):
+            return (
+                db.query(models.OptionSet.id)
+                .filter(models.OptionSet.question_id == question_id, models.OptionSet.is_active == True)
+                .scalar()
+            )
+
+    return active_cache.get_or_load(ACTIVE_OPTION_SET_BY_QUESTION, question_id, load)
+
+def get_active_option_set_by_question(db: Session, question_id: int) -> Optional[models.OptionSet]:
+    os_id = get_active_option_set_id_by_question(db, question_id)
+    if os_id is None:
+        return None
+    with primary_reads(db):
+        os = db.get(models.OptionSet, os_id)
+        if os is None or not os.is_active:
+            # Stale entry (missed invalidation): heal and re-resolve
+            active_cache.invalidate(ACTIVE_OPTION_SET_BY_QUESTION, question_id, publish=False)
+            return (
+                db.query(models.OptionSet)
+                .filter(models.OptionSet.question_id == question_id, models.OptionSet.is_active == True)
+                .first()
+            )
+    return os
+
+ONE_ACTIVE_MESSAGE = "There is already an active OptionSet for this Question"
+
+def _one_active_error(exc: IntegrityError) -> Exception:
+    # The one-active unique index rejected the write; report it like the validator does
+    if models.violates_one_active(exc, "option_sets", "question_id"):
+        return ValueError(ONE_ACTIVE_MESSAGE)
+    return exc
+
 def create_option_set(db: Session, obj_in: schemas.OptionSetCreate) -> models.OptionSet:
-    os = models.OptionSet(
-        question_id=obj_in.question_id,
-        version=obj_in.version,
-        is_active=obj_in.is_active
-    )
-    db.add(os)
-    db.commit()
-    for opt in obj_in.options:
-        db.add(models.Option(
-            text=opt.text,
-            score=opt.score,
-            option_set_id=os.id
-        ))
-    db.commit()
+    os = bulk_create_option_sets(db, [obj_in])[0]
     db.refresh(os)
     return os
 
+# ─── Bulk creation (authoring imports) ───────────────────────
+
+def _question_max_scores(db: Session, question_ids: Iterable[int]) -> Dict[int, int]:
+    rows = db.execute(
+        select(models.Question.id, models.Question.max_score)
+        .where(models.Question.id.in_(list(question_ids)))
+    ).all()
+    return {q_id: max_score for q_id, max_score in rows}
+
+def _parent_questions(db: Session, parent_ids: Iterable[int]) -> Dict[int, int]:
+    rows = db.execute(
+        select(models.OptionSet.id, models.OptionSet.question_id)
+        .where(models.OptionSet.id.in_(list(parent_ids)))
+    ).all()
+    return {os_id: q_id for os_id, q_id in rows}
+
+def bulk_create_option_sets(db: Session, items: List[schemas.OptionSetCreate]) -> List[models.OptionSet]:
+    """
+    Create many OptionSets, possibly across many questions, with all their
+    options in one transaction.
+
+    Option scores are validated up front against one max_score lookup per
+    distinct question, so nothing is written if any option is invalid. The
+    sets are flushed through the ORM (where the one-active index applies) and
+    all options go out as one multi-row INSERT. Any failure rolls back the
+    whole call.
+    """
+    # Validated against the primary: a replica may not have a just-created question yet
+    with primary_reads(db):
+        max_scores = _question_max_scores(db, {item.question_id for item in items})
+        parents = {item.parent_id for item in items if item.parent_id is not None}
+        parent_questions = _parent_questions(db, parents) if parents else {}
+
+    for index, item in enumerate(items):
+        max_score = max_scores.get(item.question_id)
+        if max_score is None:
+            raise ValueError(f"OptionSet #{index}: Question {item.question_id} not found")
+        for opt in item.options:
+            if opt.score > max_score:
+                raise ValueError(
+                    f"OptionSet #{index}: Option score {opt.score} exceeds question’s max_score {max_score}"
+                )
+
+    for index, item in enumerate(items):
+        if item.parent_id is not None and parent_questions.get(item.parent_id) != item.question_id:
+            raise ValueError(
+                f"OptionSet #{index}: parent OptionSet {item.parent_id} not found for Question {item.question_id}"
+            )
+
+    option_sets = [
+        models.OptionSet(
+            question_id=item.question_id,
+            parent_id=item.parent_id,
+            version=item.version,
+            is_active=item.is_active,
+        )
+        for item in items
+    ]
+    try:
+        db.add_all(option_sets)
+        db.flush()
+        option_rows = [
+            {"text": opt.text, "score": opt.score, "option_set_id": os.id}
+            for os, item in zip(option_sets, items)
+            for opt in item.options
+        ]
+        if option_rows:
+            db.execute(insert(models.Option), option_rows)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _one_active_error(exc) from exc
+    except Exception:
+        db.rollback()
+        raise
+
+    activated = {item.question_id for item in items if item.is_active}
+    for question_id in activated:
+        active_cache.invalidate(ACTIVE_OPTION_SET_BY_QUESTION, question_id)
+    if activated:
+        # Published snapshots embed the active OptionSet of each question
+        active_cache.invalidate(SNAPSHOT_VERSION)
+    if parents:
+        # Every ancestor may have a new latest descendant
+        active_cache.invalidate(LATEST_OPTION_SET_DESCENDANT)
+    return option_sets
+
 def update_option_set(db: Session, db_obj: models.OptionSet, obj_in: schemas.OptionSetCreate) -> models.OptionSet:
+    old_question_id = db_obj.question_id
+    if obj_in.question_id != old_question_id:
+        # The existing options must fit the new question's max_score
+        with primary_reads(db):
+            max_score = _question_max_scores(db, [obj_in.question_id]).get(obj_in.question_id)
+            top_score = db.scalar(
+                select(func.max(models.Option.score)).where(models.Option.option_set_id == db_obj.id)
+            )
+        if max_score is None:
+            raise ValueError(f"Question {obj_in.question_id} not found")
+        if top_score is not None and top_score > max_score:
+            raise ValueError(f"Option score {top_score} exceeds question’s max_score {max_score}")
     setattr(db_obj, "question_id", obj_in.question_id)
     setattr(db_obj, "version", obj_in.version)
     setattr(db_obj, "is_active", obj_in.is_active)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _one_active_error(exc) from exc
+    active_cache.invalidate(ACTIVE_OPTION_SET_BY_QUESTION, old_question_id)
+    if obj_in.question_id != old_question_id:
+        active_cache.invalidate(ACTIVE_OPTION_SET_BY_QUESTION, obj_in.question_id)
+    active_cache.invalidate(LATEST_OPTION_SET_DESCENDANT)  # the version may have changed
+    active_cache.invalidate(SNAPSHOT_VERSION)
     db.refresh(db_obj)
     return db_obj
 
 def delete_option_set(db: Session, db_obj: models.OptionSet) -> None:
+    question_id, was_active = db_obj.question_id, db_obj.is_active
     db.delete(db_obj)
     db.commit()
+    if was_active:
+        active_cache.invalidate(ACTIVE_OPTION_SET_BY_QUESTION, question_id)
+        active_cache.invalidate(SNAPSHOT_VERSION)
+    active_cache.invalidate(LATEST_OPTION_SET_DESCENDANT)
+
+# ─── Lineage (parent_id) ─────────────────────────────────────
+# Each walk is one WITH RECURSIVE query, however deep the history.
+
+# Guards against parent_id cycles; also below MySQL's cte_max_recursion_depth
+MAX_LINEAGE_DEPTH = 500
+
+def _lineage(option_set_id: int, ancestors: bool):
+    """Recursive CTE of (id, depth) from ``option_set_id`` (depth 0) up or down the parent_id links."""
+    os = models.OptionSet
+    lineage = (
+        select(os.id, os.parent_id, literal(0).label("depth"))
+        .where(os.id == option_set_id)
+        .cte("lineage", recursive=True)
+    )
+    link = os.id == lineage.c.parent_id if ancestors else os.parent_id == lineage.c.id
+    return lineage.union_all(
+        select(os.id, os.parent_id, lineage.c.depth + 1)
+        .join(lineage, link)
+        .where(lineage.c.depth < MAX_LINEAGE_DEPTH)
+    )
+
+def _walk(db: Session, option_set_id: int, ancestors: bool) -> List[models.OptionSet]:
+    lineage = _lineage(option_set_id, ancestors)
+    return list(db.scalars(
+        select(models.OptionSet)
+        .join(lineage, lineage.c.id == models.OptionSet.id)
+        .where(lineage.c.depth > 0)
+        .order_by(lineage.c.depth, models.OptionSet.id)
+    ))
+
+def get_option_set_ancestors(db: Session, option_set_id: int) -> List[models.OptionSet]:
+    """The OptionSets this one was derived from, parent first."""
+    return _walk(db, option_set_id, ancestors=True)
+
+def get_option_set_descendants(db: Session, option_set_id: int) -> List[models.OptionSet]:
+    """Every OptionSet derived from this one, directly or not, nearest first."""
+    return _walk(db, option_set_id, ancestors=False)
+
+def get_latest_descendant_id(db: Session, option_set_id: int) -> Optional[int]:
+    """
+    Highest-version OptionSet in the lineage below ``option_set_id`` (itself
+    if nothing was derived from it); None if it doesn't exist. Cached, so a
+    stale reference resolves to the current version without a query.
+    """
+    def load() -> Optional[int]:
+        lineage = _lineage(option_set_id, ancestors=False)
+        with primary_reads(db):  # cached for everyone: don't fill it from a lagging replica
+            return db.execute(
+                select(models.OptionSet.id)
+                .join(lineage, lineage.c.id == models.OptionSet.id)
+                .order_by(models.OptionSet.version.desc(), models.OptionSet.id.desc())
+                .limit(1)
+            ).scalar_one_or_none()
+
+    return active_cache.get_or_load(LATEST_OPTION_SET_DESCENDANT, option_set_id, load)
+
+def get_latest_descendant(db: Session, option_set_id: int) -> Optional[models.OptionSet]:
+    latest_id = get_latest_descendant_id(db, option_set_id)
+    with primary_reads(db):
+        os = db.get(models.OptionSet, latest_id) if latest_id is not None else None
+        if os is None and latest_id is not None:
+            # Stale entry (deleted elsewhere): heal and re-resolve
+            active_cache.invalidate(LATEST_OPTION_SET_DESCENDANT, option_set_id, publish=False)
+            latest_id = get_latest_descendant_id(db, option_set_id)
+            os = db.get(models.OptionSet, latest_id) if latest_id is not None else None
+    return os
+
+def diff_option_sets(db: Session, from_id: int, to_id: int) -> schemas.OptionSetDiff:
+    """
+    Options added, removed and rescored going from one OptionSet to another,
+    matched by option text, in one query. The two sets need not be related.
+    """
+    options: Dict[int, Dict[str, int]] = {from_id: {}, to_id: {}}
+    rows = db.execute(
+        select(models.Option.option_set_id, models.Option.text, models.Option.score)
+        .where(models.Option.option_set_id.in_([from_id, to_id]))
+        .order_by(models.Option.id)
+    )
+    for os_id, text, score in rows:
+        options[os_id][text] = score
+    old, new = options[from_id], options[to_id]
+    return schemas.OptionSetDiff(
+        from_id=from_id,
+        to_id=to_id,
+        added=[schemas.OptionBase(text=t, score=s) for t, s in new.items() if t not in old],
+        removed=[schemas.OptionBase(text=t, score=s) for t, s in old.items() if t not in new],
+        rescored=[
+            schemas.OptionRescore(text=t, old_score=old[t], new_score=s)
+            for t, s in new.items() if t in old and old[t] != s
+        ],
+    )
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from models import Question,QuestionSet
-from schemas import QuestionCreate
+from app.models import Question,QuestionSet
+from app.schemas import QuestionCreate
+from app.pagination import Page, paginate
 from typing import List, Optional
 
 def create_question(db: Session, question: QuestionCreate) -> Question:
@@ -19,6 +20,9 @@ def get_question(db: Session, question_id: int) -> Optional[Question]:
 def get_questions(db: Session, skip: int = 0, limit: int = 100) -> List[Question]:
     return db.query(Question).offset(skip).limit(limit).all()
 
+def get_questions_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[Question]:
+    return paginate(db.query(Question), (Question.id,), cursor, limit)
+
 def get_questions_by_question_set(db: Session, question_set_id: int) -> List[Question]:
     return (
         db.query(Question)
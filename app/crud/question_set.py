@@ -1,33 +1,82 @@
+from sqlalchemy import insert, literal, select, union
 from sqlalchemy.orm import Session
-from models import QuestionSet, Question
-from schemas import QuestionSetCreate
+from app.cache import ACTIVE_QUESTION_SET_BY_ASSESSMENT, SNAPSHOT_VERSION, active_cache
+from app.crud.version_counter import QUESTION_SET_VERSIONS, allocate_version
+from app.db_routing import primary_reads
+from app.models import QuestionSet, Question, question_set_questions
+from app.schemas import QuestionSetCreate, QuestionSetDerive
+from app.pagination import Page, paginate
 from typing import List, Optional
 
 # ─── Create QuestionSet with auto versioning ─────────────────
 
-def create_question_set(db: Session, data: QuestionSetCreate) -> QuestionSet:
-    # Get latest version for the given assessment
-    last_qs = (
-        db.query(QuestionSet)
-        .filter(QuestionSet.assessment_id == data.assessment_id)
-        .order_by(QuestionSet.version.desc())
-        .first()
-    )
-    new_version = (last_qs.version + 1) if last_qs else 1
-
+def _new_version(db: Session, assessment_id: int) -> QuestionSet:
+    # Next version for the given assessment, allocated atomically
     db_qs = QuestionSet(
-        assessment_id=data.assessment_id,
-        version=new_version,
+        assessment_id=assessment_id,
+        version=allocate_version(db, QUESTION_SET_VERSIONS, assessment_id),
         is_active=False  # Always false on creation
     )
-
     db.add(db_qs)
+    db.flush()
+    return db_qs
+
+def create_question_set(db: Session, data: QuestionSetCreate) -> QuestionSet:
+    db_qs = _new_version(db, data.assessment_id)
+
+    # Link questions straight from the questions table (unknown ids are skipped)
+    if data.question_ids:
+        db.execute(
+            insert(question_set_questions).from_select(
+                ["question_set_id", "question_id"],
+                select(literal(db_qs.id), Question.id).where(Question.id.in_(data.question_ids)),
+            )
+        )
+
     db.commit()
     db.refresh(db_qs)
+    return db_qs
 
-    # Link questions
-    questions = db.query(Question).filter(Question.id.in_(data.question_ids)).all()
-    db_qs.questions.extend(questions)
+# ─── Derive a new version from an existing one ───────────────
+
+def derive_question_set(db: Session, data: QuestionSetDerive) -> Optional[QuestionSet]:
+    """
+    Create the next version of a QuestionSet's assessment with the base set's
+    questions, minus ``remove_question_ids``, plus ``add_question_ids``.
+
+    The links are copied inside the database with one INSERT…SELECT; no
+    Question objects are loaded however large the set. Returns None if the
+    base set doesn't exist; an unknown id in ``add_question_ids`` raises
+    ValueError, so a typo can't silently publish a smaller set.
+    """
+    both = set(data.add_question_ids) & set(data.remove_question_ids)
+    if both:
+        raise ValueError(f"Questions {sorted(both)} are both added and removed")
+
+    with primary_reads(db):  # the base set and the questions may have just been created
+        assessment_id = db.execute(
+            select(QuestionSet.assessment_id).where(QuestionSet.id == data.base_question_set_id)
+        ).scalar_one_or_none()
+        if assessment_id is None:
+            return None
+        if data.add_question_ids:
+            found = set(db.scalars(select(Question.id).where(Question.id.in_(data.add_question_ids))))
+            missing = set(data.add_question_ids) - found
+            if missing:
+                raise ValueError(f"Questions {sorted(missing)} not found")
+
+    db_qs = _new_version(db, assessment_id)
+
+    link = question_set_questions.c
+    kept = select(literal(db_qs.id), link.question_id).where(link.question_set_id == data.base_question_set_id)
+    if data.remove_question_ids:
+        kept = kept.where(link.question_id.not_in(data.remove_question_ids))
+    rows = kept
+    if data.add_question_ids:
+        # UNION drops ids the base set already has
+        added = select(literal(db_qs.id), Question.id).where(Question.id.in_(data.add_question_ids))
+        rows = union(kept, added)
+    db.execute(insert(question_set_questions).from_select(["question_set_id", "question_id"], rows))
 
     db.commit()
     db.refresh(db_qs)
@@ -48,22 +97,56 @@ def get_question_sets_by_assessment(db: Session, assessment_id: int) -> List[Que
         .all()
     )
 
+def get_question_sets_by_assessment_page(
+    db: Session, assessment_id: int, cursor: Optional[str] = None, limit: int = 100
+) -> Page[QuestionSet]:
+    # Newest version first, like get_question_sets_by_assessment
+    query = db.query(QuestionSet).filter(QuestionSet.assessment_id == assessment_id)
+    return paginate(query, (QuestionSet.version, QuestionSet.id), cursor, limit, descending=True)
+
 # ─── Get active QuestionSet by assessment ID ─────────────────
 
+def get_active_question_set_id_by_assessment(db: Session, assessment_id: int) -> Optional[int]:
+    # Served from the active-pointer cache; activate_question_set invalidates it.
+    # Loaded from the primary: a lagging replica would refill it with the old id.
+    def load() -> Optional[int]:
+        with primary_reads(db):
+            return (
+                db.query(QuestionSet.id)
+                .filter(
+                    QuestionSet.assessment_id == assessment_id,
+                    QuestionSet.is_active == True
+                )
+                .scalar()
+            )
+
+    return active_cache.get_or_load(ACTIVE_QUESTION_SET_BY_ASSESSMENT, assessment_id, load)
+
 def get_active_question_set_by_assessment(db: Session, assessment_id: int) -> Optional[QuestionSet]:
-    return (
-        db.query(QuestionSet)
-        .filter(
-            QuestionSet.assessment_id == assessment_id,
-            QuestionSet.is_active == True
-        )
-        .first()
-    )
+    qs_id = get_active_question_set_id_by_assessment(db, assessment_id)
+    if qs_id is None:
+        return None
+    with primary_reads(db):
+        qs = db.get(QuestionSet, qs_id)
+        if qs is None or not qs.is_active:
+            # Stale entry (missed invalidation): heal and re-resolve
+            active_cache.invalidate(ACTIVE_QUESTION_SET_BY_ASSESSMENT, assessment_id, publish=False)
+            return (
+                db.query(QuestionSet)
+                .filter(
+                    QuestionSet.assessment_id == assessment_id,
+                    QuestionSet.is_active == True
+                )
+                .first()
+            )
+    return qs
 
 # ─── Activate a specific QuestionSet ─────────────────────────
 
 def activate_question_set(db: Session, question_set_id: int) -> Optional[QuestionSet]:
-    qs = get_question_set(db, question_set_id)
+    # From the primary: a lagging replica may not have a just-created set
+    with primary_reads(db):
+        qs = get_question_set(db, question_set_id)
     if not qs:
         return None
 
@@ -75,6 +158,16 @@ def activate_question_set(db: Session, question_set_id: int) -> Optional[Questio
     ).update({QuestionSet.is_active: False})  # type: ignore
 
     qs.is_active = True  # type: ignore
+    assessment_id = qs.assessment_id
     db.commit()
+    active_cache.invalidate(ACTIVE_QUESTION_SET_BY_ASSESSMENT, assessment_id)
+    # The sets just deactivated stop being served
+    active_cache.invalidate(SNAPSHOT_VERSION)
+
+    # Freeze the published version into a cacheable snapshot (imported here:
+    # app.snapshots depends on this module through the tree loader)
+    from app.snapshots import publish_snapshot
+    publish_snapshot(db, question_set_id)
+
     db.refresh(qs)
     return qs
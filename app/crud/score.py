@@ -0,0 +1,218 @@
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models import Submission, SubmissionScore
+from app.scoring import score_question_set
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SCORED = "scored"
+FAILED = "failed"
+
+# ─── Finalization: record pending rows and enqueue ───────────
+
+def add_pending_scores(db: Session, submissions: Iterable[Tuple[int, int]]) -> None:
+    """Insert "pending" score rows for new (submission_id, question_set_id) pairs; caller commits."""
+    rows = [
+        {"submission_id": sub_id, "question_set_id": qs_id, "status": PENDING, "attempts": 0}
+        for sub_id, qs_id in submissions
+    ]
+    if rows:
+        db.execute(insert(SubmissionScore), rows)
+
+def dispatch_scoring(submissions: Iterable[Tuple[int, int]]) -> int:
+    """
+    Send (submission_id, question_set_id) pairs to the scorers, grouped by
+    question set in micro-batches of SCORING_BATCH_SIZE. Call after commit.
+    Returns the number of batches dispatched.
+
+    A batch that can't be dispatched (e.g. the broker is down) is logged and
+    skipped, never raised: its rows are already committed as pending, and
+    ``requeue_stale_scores`` picks them up later.
+    """
+    by_set: Dict[int, List[int]] = defaultdict(list)
+    for sub_id, qs_id in submissions:
+        by_set[qs_id].append(sub_id)
+
+    batches = 0
+    size = get_settings().scoring_batch_size
+    for qs_id, sub_ids in by_set.items():
+        for start in range(0, len(sub_ids), size):
+            batch = sub_ids[start:start + size]
+            try:
+                _dispatch(qs_id, batch)
+            except Exception:
+                logger.exception(
+                    "Could not dispatch scoring of %d submissions for question set %s; left pending",
+                    len(batch), qs_id,
+                )
+                continue
+            batches += 1
+    return batches
+
+def finalize_submissions(db: Session, submission_ids: Sequence[int]) -> int:
+    """
+    (Re)queue scoring for existing submissions. Safe to call repeatedly:
+    already-scored submissions are skipped, failed ones are retried.
+    """
+    rows = db.execute(
+        select(Submission.id, Submission.question_set_id, SubmissionScore.status)
+        .outerjoin(SubmissionScore, SubmissionScore.submission_id == Submission.id)
+        .where(Submission.id.in_(list(submission_ids)))
+    ).all()
+
+    add_pending_scores(db, [(sub_id, qs_id) for sub_id, qs_id, status in rows if status is None])
+    failed = [sub_id for sub_id, _, status in rows if status == FAILED]
+    if failed:
+        db.execute(
+            update(SubmissionScore)
+            .where(SubmissionScore.submission_id.in_(failed))
+            .values(status=PENDING, error=None)
+        )
+    db.commit()
+    return dispatch_scoring([(sub_id, qs_id) for sub_id, qs_id, status in rows if status != SCORED])
+
+def _server_now_minus(db: Session, delta: timedelta):
+    """
+    SQL for the database clock minus ``delta``. queued_at is filled by the
+    server's now() (the session time zone on MySQL), so the cutoff must come
+    from the same clock, not from Python's UTC time.
+    """
+    seconds = int(delta.total_seconds())
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        return func.date_sub(func.now(), text(f"INTERVAL {seconds} SECOND"))
+    if dialect == "sqlite":
+        # CURRENT_TIMESTAMP and datetime('now') are both UTC text
+        return func.datetime("now", f"{-seconds:+d} seconds")
+    return func.now() - delta
+
+def requeue_stale_scores(db: Session, older_than: timedelta, limit: int = 10_000) -> int:
+    """
+    Re-dispatch score rows still pending ``older_than`` after they were
+    queued (lost dispatches, dropped messages), oldest first, at most
+    ``limit`` per call. Their queued_at is reset so the next sweep waits
+    again. Returns the number of submissions requeued; run periodically by
+    the ``scoring.requeue_stale_scores`` beat task.
+    """
+    cutoff = _server_now_minus(db, older_than)
+    stale = list(db.scalars(
+        select(SubmissionScore.submission_id)
+        .where(SubmissionScore.status == PENDING, SubmissionScore.queued_at < cutoff)
+        .order_by(SubmissionScore.queued_at)
+        .limit(limit)
+    ))
+    if not stale:
+        return 0
+    db.execute(
+        update(SubmissionScore)
+        .where(SubmissionScore.submission_id.in_(stale), SubmissionScore.status == PENDING)
+        .values(queued_at=func.now())
+    )
+    finalize_submissions(db, stale)  # commits
+    logger.info("Requeued %d stale pending scores", len(stale))
+    return len(stale)
+
+# ─── Dispatch backends ───────────────────────────────────────
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_thread_pool_lock = threading.Lock()
+
+def _dispatch(question_set_id: int, submission_ids: List[int]) -> None:
+    from app.tasks import score_submissions_task
+
+    settings = get_settings()
+    if settings.scoring_mode == "thread":
+        global _thread_pool
+        with _thread_pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(max_workers=settings.scoring_threads, thread_name_prefix="scoring")
+            # apply() runs the task body locally, retries included
+            _thread_pool.submit(score_submissions_task.apply, args=(question_set_id, submission_ids))
+    else:
+        # "celery" enqueues to the broker; "eager" (task_always_eager) runs inline
+        score_submissions_task.delay(question_set_id, submission_ids)
+
+def wait_for_thread_scoring() -> None:
+    """Drain the in-process pool (SCORING_MODE=thread); for tests and shutdown."""
+    global _thread_pool
+    with _thread_pool_lock:
+        pool, _thread_pool = _thread_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+# ─── Worker side ─────────────────────────────────────────────
+
+def score_submissions(db: Session, question_set_id: int, submission_ids: Sequence[int]) -> int:
+    """
+    Score one micro-batch and store the results. Idempotent: re-running it
+    recomputes the same numbers and overwrites the same rows.
+    """
+    db.execute(
+        update(SubmissionScore)
+        .where(SubmissionScore.submission_id.in_(list(submission_ids)))
+        .values(attempts=SubmissionScore.attempts + 1)
+    )
+    db.commit()  # keep the attempt count even if scoring fails below
+    scores = score_question_set(db, question_set_id, submission_ids)
+    max_score = int(scores.max_scores.sum())
+    now = datetime.now(timezone.utc)
+
+    rows = [
+        {
+            "submission_id": int(sub_id),
+            "total_score": int(total),
+            "max_score": max_score,
+            "percentage": float(pct),
+            "status": SCORED,
+            "error": None,
+            "scored_at": now,
+        }
+        for sub_id, total, pct in zip(scores.submission_ids, scores.totals, scores.percentages)
+    ]
+    if rows:
+        # ORM bulk UPDATE by primary key: one executemany for the whole batch
+        db.execute(update(SubmissionScore), rows)
+    db.commit()
+    return len(rows)
+
+def mark_failed(db: Session, submission_ids: Sequence[int], error: str) -> None:
+    db.execute(
+        update(SubmissionScore)
+        .where(
+            SubmissionScore.submission_id.in_(list(submission_ids)),
+            SubmissionScore.status != SCORED,
+        )
+        .values(status=FAILED, error=error[:500])
+    )
+    db.commit()
+
+# ─── Status queries ──────────────────────────────────────────
+
+def get_submission_score(db: Session, submission_id: int) -> Optional[SubmissionScore]:
+    return db.get(SubmissionScore, submission_id)
+
+def get_submission_scores(db: Session, submission_ids: Sequence[int]) -> List[SubmissionScore]:
+    return (
+        db.query(SubmissionScore)
+        .filter(SubmissionScore.submission_id.in_(list(submission_ids)))
+        .all()
+    )
+
+def get_scoring_progress(db: Session, question_set_id: int) -> Dict[str, int]:
+    """Count of score rows per status for a question set, e.g. {"pending": 3, "scored": 997}."""
+    rows = db.execute(
+        select(SubmissionScore.status, func.count())
+        .where(SubmissionScore.question_set_id == question_set_id)
+        .group_by(SubmissionScore.status)
+    ).all()
+    progress = {PENDING: 0, SCORED: 0, FAILED: 0}
+    progress.update({status: count for status, count in rows})
+    return progress
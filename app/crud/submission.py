@@ -0,0 +1,346 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.crud.score import PENDING, add_pending_scores, dispatch_scoring
+from app.db_routing import primary_reads
+from app.item_analysis import record_submissions
+from app.pagination import Page, paginate
+
+Pair = Tuple[int, int]  # (user_id, question_set_id)
+
+# Rows per multi-row INSERT / IN-list; keeps statements well under driver packet limits
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _answers(responses: Iterable[schemas.ResponseCreate]) -> Dict[int, int]:
+    """question_id -> option_id; a question answered twice keeps its last answer."""
+    return {resp.question_id: resp.option_id for resp in responses}
+
+
+def _submission_ids_for(db: Session, pairs: List[Pair], batch_size: int) -> Dict[Pair, int]:
+    """Map (user_id, question_set_id) -> submission id for the pairs that exist."""
+    found: Dict[Pair, int] = {}
+    for chunk in _chunked(pairs, batch_size):
+        rows = db.execute(
+            select(
+                models.Submission.id,
+                models.Submission.user_id,
+                models.Submission.question_set_id,
+            ).where(
+                tuple_(models.Submission.user_id, models.Submission.question_set_id).in_(chunk)
+            )
+        ).all()
+        for sub_id, user_id, qs_id in rows:
+            found[(user_id, qs_id)] = sub_id
+    return found
+
+
+def _existing_ids(db: Session, column, values: Iterable[int], batch_size: int) -> Set[int]:
+    found: Set[int] = set()
+    for chunk in _chunked(sorted(set(values)), batch_size):
+        found.update(db.execute(select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+def _invalid_submissions(
+    db: Session,
+    items: List[schemas.SubmissionCreate],
+    indexes: Iterable[int],
+    batch_size: int,
+) -> Dict[int, str]:
+    """
+    index -> why the submission can't be stored: unknown user or question set,
+    a question outside the set, or an option of another question. One IN
+    query per chunk of distinct ids, so one bad row doesn't fail the batch.
+    """
+    indexes = list(indexes)
+    subs = [items[i] for i in indexes]
+    users = _existing_ids(db, models.User.id, (sub.user_id for sub in subs), batch_size)
+    qs_ids = _existing_ids(db, models.QuestionSet.id, (sub.question_set_id for sub in subs), batch_size)
+    set_questions = _set_questions(db, qs_ids, batch_size)
+    option_question = _option_questions(db, (resp.option_id for sub in subs for resp in sub.responses), batch_size)
+
+    invalid: Dict[int, str] = {}
+    for index, sub in zip(indexes, subs):
+        if sub.user_id not in users:
+            invalid[index] = f"user {sub.user_id} not found"
+        elif sub.question_set_id not in qs_ids:
+            invalid[index] = f"question set {sub.question_set_id} not found"
+        else:
+            error = _invalid_answer(sub.question_set_id, _answers(sub.responses), set_questions, option_question)
+            if error is not None:
+                invalid[index] = error
+    return invalid
+
+
+def _set_questions(db: Session, question_set_ids: Iterable[int], batch_size: int) -> Set[Pair]:
+    """(question_set_id, question_id) links of the given sets."""
+    found: Set[Pair] = set()
+    link = models.question_set_questions.c
+    for chunk in _chunked(sorted(set(question_set_ids)), batch_size):
+        found.update(
+            db.execute(select(link.question_set_id, link.question_id).where(link.question_set_id.in_(chunk))).all()
+        )
+    return found
+
+
+def _option_questions(db: Session, option_ids: Iterable[int], batch_size: int) -> Dict[int, int]:
+    """option_id -> the question its OptionSet belongs to, for the options that exist."""
+    found: Dict[int, int] = {}
+    for chunk in _chunked(sorted(set(option_ids)), batch_size):
+        found.update(db.execute(
+            select(models.Option.id, models.OptionSet.question_id)
+            .join(models.OptionSet, models.OptionSet.id == models.Option.option_set_id)
+            .where(models.Option.id.in_(chunk))
+        ).all())
+    return found
+
+
+def _invalid_answer(
+    question_set_id: int,
+    answers: Dict[int, int],
+    set_questions: Set[Pair],
+    option_question: Dict[int, int],
+) -> Optional[str]:
+    """Why one answer sheet can't be stored, or None."""
+    for question_id, option_id in answers.items():
+        if (question_set_id, question_id) not in set_questions:
+            return f"question {question_id} is not in question set {question_set_id}"
+        if option_question.get(option_id) != question_id:
+            return f"option {option_id} is not an option of question {question_id}"
+    return None
+
+
+# ─── Bulk ingestion ──────────────────────────────────────────
+
+def bulk_create_submissions(
+    db: Session,
+    submissions: Iterable[schemas.SubmissionCreate],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    enqueue_scoring: bool = True,
+) -> List[schemas.SubmissionIngestResult]:
+    """
+    Insert many submissions with their responses in a single transaction.
+
+    Submissions and responses are written with multi-row INSERTs (executemany)
+    instead of one ORM object per row. A submission that collides with
+    ``uq_submission_per_user_per_qset`` – either against an existing row or an
+    earlier entry of the same batch – is reported as a conflict and skipped; one
+    with an unknown user/question set, a question outside its set or an option
+    of another question is reported as invalid and skipped; everything else is
+    committed together. Results are returned in input order.
+
+    The item analysis summaries (app.item_analysis) are updated in the same
+    transaction. Created submissions are finalized: a "pending" score row is written in the
+    same transaction and scoring is dispatched after commit (see app.crud.score).
+    """
+    items = list(submissions)
+
+    # Concurrent writers can insert one of our pairs between the pre-check and
+    # our INSERT; the unique constraint then aborts the batch, so re-check once.
+    # The pre-checks read the primary: a lagging replica would miss a resent
+    # submission and turn its "conflict" into an IntegrityError.
+    with primary_reads(db):
+        for attempt in range(2):
+            try:
+                return _ingest(db, items, batch_size, enqueue_scoring)
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+    raise AssertionError("unreachable")
+
+
+def _ingest(
+    db: Session,
+    items: List[schemas.SubmissionCreate],
+    batch_size: int,
+    enqueue_scoring: bool,
+) -> List[schemas.SubmissionIngestResult]:
+    results: List[Optional[schemas.SubmissionIngestResult]] = [None] * len(items)
+
+    def reject(index: int, detail: str, status: str = "conflict") -> None:
+        sub = items[index]
+        results[index] = schemas.SubmissionIngestResult(
+            index=index,
+            user_id=sub.user_id,
+            question_set_id=sub.question_set_id,
+            status=status,
+            detail=detail,
+        )
+
+    # Duplicates inside the batch: first occurrence wins
+    accepted: Dict[Pair, int] = {}
+    for index, sub in enumerate(items):
+        pair = (sub.user_id, sub.question_set_id)
+        if pair in accepted:
+            reject(index, f"duplicate of submission #{accepted[pair]} in this batch")
+        else:
+            accepted[pair] = index
+
+    # Duplicates against what is already stored: one IN query per chunk
+    existing: Set[Pair] = set(_submission_ids_for(db, list(accepted), batch_size))
+    for pair in existing:
+        reject(accepted.pop(pair), "user already has a submission for this question set")
+
+    # Foreign keys and set membership, checked up front instead of failing the batch
+    for index, detail in _invalid_submissions(db, items, accepted.values(), batch_size).items():
+        sub = items[index]
+        del accepted[(sub.user_id, sub.question_set_id)]
+        reject(index, detail, "invalid")
+
+    pairs = list(accepted)
+    for chunk in _chunked(pairs, batch_size):
+        db.execute(
+            insert(models.Submission),
+            [{"user_id": user_id, "question_set_id": qs_id} for user_id, qs_id in chunk],
+        )
+
+    # MySQL has no RETURNING, so read the generated ids back by natural key
+    ids = _submission_ids_for(db, pairs, batch_size)
+
+    # uq_response_submission_question allows one answer per question
+    answers = {pair: _answers(items[index].responses) for pair, index in accepted.items()}
+    response_rows = [
+        {"submission_id": ids[pair], "question_id": question_id, "option_id": option_id}
+        for pair, by_question in answers.items()
+        for question_id, option_id in by_question.items()
+    ]
+    for chunk in _chunked(response_rows, batch_size):
+        db.execute(insert(models.Response), chunk)
+
+    record_submissions(db, [(pair[1], list(by_question.items())) for pair, by_question in answers.items()])
+
+    created = [(ids[pair], pair[1]) for pair in pairs]
+    if enqueue_scoring:
+        for chunk in _chunked(created, batch_size):
+            add_pending_scores(db, chunk)
+
+    db.commit()
+
+    if enqueue_scoring:
+        dispatch_scoring(created)
+
+    for pair, index in accepted.items():
+        results[index] = schemas.SubmissionIngestResult(
+            index=index,
+            user_id=pair[0],
+            question_set_id=pair[1],
+            status="created",
+            submission_id=ids[pair],
+        )
+    return results  # type: ignore[return-value]
+
+
+# ─── Autosave ────────────────────────────────────────────────
+
+def upsert_responses(
+    db: Session,
+    submission_id: int,
+    responses: Iterable[schemas.ResponseCreate],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Save a submission's answers, replacing earlier answers to the same questions.
+
+    The answers are checked like ``bulk_create_submissions`` checks them: a
+    question outside the submission's set or an option of another question
+    raises ValueError (as does an unknown submission) and nothing is written.
+
+    One multi-row INSERT per ``batch_size`` answers, whether or not they exist
+    yet: ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT DO UPDATE elsewhere,
+    both keyed on uq_response_submission_question. A question answered twice
+    in ``responses`` keeps its last answer. Returns the number of answers
+    written.
+
+    In the same transaction the item analysis summaries swap the old answer
+    sheet for the new one and the score goes back to "pending"; scoring is
+    dispatched after commit. Re-sending unchanged answers skips both, so
+    autosave clients can simply send everything they have.
+    """
+    answers = _answers(responses)
+    with primary_reads(db):
+        # The row lock serializes autosaves of one submission, so the summary deltas don't race
+        question_set_id = db.execute(
+            select(models.Submission.question_set_id)
+            .where(models.Submission.id == submission_id)
+            .with_for_update()
+        ).scalar_one_or_none()
+        if question_set_id is None:
+            raise ValueError(f"Submission {submission_id} not found")
+        error = _invalid_answer(
+            question_set_id,
+            answers,
+            _set_questions(db, [question_set_id], batch_size),
+            _option_questions(db, answers.values(), batch_size),
+        )
+        if error is not None:
+            raise ValueError(error)
+        old = dict(db.execute(
+            select(models.Response.question_id, models.Response.option_id)
+            .where(models.Response.submission_id == submission_id)
+        ).all())
+
+    new = {**old, **answers}
+    changed = new != old
+    rows = [
+        {"submission_id": submission_id, "question_id": question_id, "option_id": option_id}
+        for question_id, option_id in answers.items()
+    ]
+    table = models.Response.__table__
+    dialect = db.get_bind().dialect.name
+    for chunk in _chunked(rows, batch_size):
+        if dialect == "mysql":
+            stmt = mysql_insert(table).values(list(chunk))
+            stmt = stmt.on_duplicate_key_update(option_id=stmt.inserted.option_id)
+        else:
+            stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table).values(list(chunk))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["submission_id", "question_id"],
+                set_={"option_id": stmt.excluded.option_id},
+            )
+        db.execute(stmt)
+
+    if changed:
+        record_submissions(db, [(question_set_id, list(new.items()))], replaced=[(question_set_id, list(old.items()))])
+        _reset_score(db, submission_id, question_set_id)
+    db.commit()
+
+    if changed:
+        dispatch_scoring([(submission_id, question_set_id)])
+    return len(rows)
+
+
+def _reset_score(db: Session, submission_id: int, question_set_id: int) -> None:
+    """Put the submission's score back to pending (adding the row if it was never finalized)."""
+    reset = db.execute(
+        update(models.SubmissionScore)
+        .where(models.SubmissionScore.submission_id == submission_id)
+        .values(status=PENDING, error=None)
+    )
+    if not reset.rowcount:
+        add_pending_scores(db, [(submission_id, question_set_id)])
+
+
+# ─── Listing ─────────────────────────────────────────────────
+
+def get_responses_page(
+    db: Session,
+    question_set_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Page[models.Response]:
+    query = db.query(models.Response)
+    if question_set_id is not None:
+        query = query.join(models.Submission).filter(models.Submission.question_set_id == question_set_id)
+    return paginate(query, (models.Response.id,), cursor, limit)
@@ -1,10 +1,13 @@
 from sqlalchemy.orm import Session
-from models import User
-from schemas import UserCreate
-from app.password_verification import get_password_hash
+from app.models import User
+from app.schemas import UserCreate
+from app.password_verification import dummy_verify, get_password_hash, verify_and_update
+from app.pagination import Page, paginate
+from typing import Optional
 
-def create_user(db: Session, user: UserCreate):
-    hashed_pw = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+    # Callers that hashed off-thread (see app.crud.aio) pass the hash in
+    hashed_pw = hashed_password or get_password_hash(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -23,5 +26,26 @@ def get_user(db: Session, user_id: int):
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(User).offset(skip).limit(limit).all()
 
+def get_users_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[User]:
+    return paginate(db.query(User), (User.id,), cursor, limit)
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
+
+def set_user_password_hash(db: Session, db_user: User, hashed_password: str) -> User:
+    setattr(db_user, "hashed_password", hashed_password)
+    db.commit()
+    return db_user
+
+def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    db_user = get_user_by_email(db, email)
+    if db_user is None:
+        dummy_verify()
+        return None
+    ok, new_hash = verify_and_update(password, db_user.hashed_password)
+    if not ok:
+        return None
+    if new_hash:
+        # Stored hash predates the current bcrypt cost: upgrade it in place
+        set_user_password_hash(db, db_user, new_hash)
+    return db_user
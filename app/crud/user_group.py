@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app import models, schemas
+from app.pagination import Page, paginate
 
 def get_user_group(db: Session, id: int) -> Optional[models.UserGroup]:
     return db.query(models.UserGroup).filter(models.UserGroup.id == id).first()
@@ -8,6 +9,9 @@ def get_user_group(db: Session, id: int) -> Optional[models.UserGroup]:
 def get_user_groups(db: Session, skip: int = 0, limit: int = 100) -> List[models.UserGroup]:
     return db.query(models.UserGroup).offset(skip).limit(limit).all()
 
+def get_user_groups_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[models.UserGroup]:
+    return paginate(db.query(models.UserGroup), (models.UserGroup.id,), cursor, limit)
+
 def create_user_group(db: Session, obj_in: schemas.UserGroupCreate) -> models.UserGroup:
     db_obj = models.UserGroup(
         name=obj_in.name,
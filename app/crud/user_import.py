@@ -0,0 +1,165 @@
+import csv
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db_routing import primary_reads
+from app.models import User, UserGroup
+from app.password_verification import hash_passwords
+from app.schemas import UserCreate, UserImportResult
+
+# Rows read, checked, hashed and inserted together; bounds memory per chunk
+DEFAULT_CHUNK_SIZE = 1000
+
+# ─── Streaming CSV import ────────────────────────────────────
+
+def import_users_csv(
+    db: Session,
+    source: TextIO,
+    default_group_id: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[UserImportResult]:
+    """
+    Import users from a CSV with columns username, email, password and
+    optionally full_name and group_id (falls back to ``default_group_id``).
+
+    Rows are processed ``chunk_size`` at a time: validated, checked for
+    unknown group ids and for existing usernames/emails with one IN query
+    each, hashed in parallel on the password process pool and inserted with a
+    single executemany, then committed. One result per row is yielded as each
+    chunk completes, so the caller can stream the report while memory stays
+    bounded by the chunk.
+    """
+    rows = enumerate(csv.DictReader(source), start=2)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        # The duplicate and group checks must see what the primary has
+        with primary_reads(db):
+            results = _import_chunk(db, chunk, default_group_id)
+        yield from results
+
+
+def _parse(row: Dict[str, str], default_group_id: Optional[int]) -> UserCreate:
+    group_id = (row.get("group_id") or "").strip() or default_group_id
+    return UserCreate(
+        username=(row.get("username") or "").strip(),
+        email=(row.get("email") or "").strip(),
+        full_name=(row.get("full_name") or "").strip() or None,
+        password=row.get("password") or "",
+        group_id=group_id,  # type: ignore[arg-type]
+    )
+
+
+def _existing_keys(db: Session, users: List[UserCreate]) -> Tuple[Set[str], Set[str]]:
+    # MySQL's default collation compares case-insensitively, so match on lower()
+    rows = db.execute(
+        select(User.username, User.email).where(
+            or_(
+                User.username.in_([u.username for u in users]),
+                User.email.in_([u.email for u in users]),
+            )
+        )
+    ).all()
+    return {r.username.lower() for r in rows}, {r.email.lower() for r in rows}
+
+
+def _existing_group_ids(db: Session, group_ids: Set[int]) -> Set[int]:
+    return set(db.scalars(select(UserGroup.id).where(UserGroup.id.in_(group_ids))))
+
+
+def _import_chunk(
+    db: Session,
+    chunk: List[Tuple[int, Dict[str, str]]],
+    default_group_id: Optional[int],
+) -> List[UserImportResult]:
+    results: Dict[int, UserImportResult] = {}
+    candidates: List[Tuple[int, UserCreate]] = []
+    seen_usernames: Set[str] = set()
+    seen_emails: Set[str] = set()
+
+    for line, row in chunk:
+        try:
+            user = _parse(row, default_group_id)
+        except ValidationError as exc:
+            results[line] = UserImportResult(
+                row=line, status="invalid",
+                username=row.get("username"), email=row.get("email"),
+                detail="; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()),
+            )
+            continue
+        if not user.password:
+            results[line] = UserImportResult(
+                row=line, status="invalid", username=user.username, email=user.email,
+                detail="password: must not be empty",
+            )
+            continue
+        name_key, email_key = user.username.lower(), user.email.lower()
+        if name_key in seen_usernames or email_key in seen_emails:
+            results[line] = UserImportResult(
+                row=line, status="duplicate", username=user.username, email=user.email,
+                detail="username or email repeated earlier in the file",
+            )
+            continue
+        seen_usernames.add(name_key)
+        seen_emails.add(email_key)
+        candidates.append((line, user))
+
+    # An unknown group would fail the foreign key and with it the whole chunk
+    group_ids = {user.group_id for _, user in candidates}
+    known_groups = _existing_group_ids(db, group_ids) if group_ids else set()
+    for line, user in candidates:
+        if user.group_id not in known_groups:
+            results[line] = UserImportResult(
+                row=line, status="invalid", username=user.username, email=user.email,
+                detail=f"group_id: UserGroup {user.group_id} not found",
+            )
+    candidates = [(line, user) for line, user in candidates if user.group_id in known_groups]
+
+    hashes: Dict[int, str] = {}
+    # A concurrent writer can take a username/email after our pre-check;
+    # the unique index then rejects the batch, so re-check once and retry.
+    for attempt in range(2):
+        existing_names, existing_emails = _existing_keys(db, [u for _, u in candidates]) if candidates else (set(), set())
+        accepted = []
+        for line, user in candidates:
+            if user.username.lower() in existing_names or user.email.lower() in existing_emails:
+                results[line] = UserImportResult(
+                    row=line, status="duplicate", username=user.username, email=user.email,
+                    detail="username or email already registered",
+                )
+            else:
+                accepted.append((line, user))
+
+        to_hash = [(line, user) for line, user in accepted if line not in hashes]
+        hashes.update(zip((line for line, _ in to_hash), hash_passwords(u.password for _, u in to_hash)))
+
+        try:
+            if accepted:
+                db.execute(
+                    insert(User),
+                    [
+                        {
+                            "username": user.username,
+                            "email": user.email,
+                            "full_name": user.full_name,
+                            "hashed_password": hashes[line],
+                            "group_id": user.group_id,
+                        }
+                        for line, user in accepted
+                    ],
+                )
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt:
+                raise
+            candidates = accepted
+
+    for line, user in accepted:
+        results[line] = UserImportResult(row=line, status="created", username=user.username, email=user.email)
+    return [results[line] for line, _ in chunk]
@@ -0,0 +1,54 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models import Assessment, QuestionSet, VersionCounter
+
+# Counter scopes: Assessment versions count per AssessmentType, QuestionSet versions per Assessment
+ASSESSMENT_VERSIONS = "assessment"
+QUESTION_SET_VERSIONS = "question_set"
+
+# Where each scope's versions live; seeds a parent's counter on first use
+_VERSIONED = {
+    ASSESSMENT_VERSIONS: (Assessment.version, Assessment.type_id),
+    QUESTION_SET_VERSIONS: (QuestionSet.version, QuestionSet.assessment_id),
+}
+
+# ─── Atomic allocation ───────────────────────────────────────
+
+def allocate_version(db: Session, scope: str, parent_id: int) -> int:
+    """
+    Return the next version for ``parent_id`` in ``scope``, in one statement.
+
+    An upsert bumps the parent's counter row and hands back the new value, so
+    concurrent callers queue on that single row lock instead of racing on
+    MAX(version) and retrying on the unique constraint. The first call for a
+    parent seeds the counter from the versions already stored. Runs in the
+    caller's transaction: the row stays locked until it commits, and a rollback
+    gives the version back, so versions stay gap-free.
+    """
+    version_col, parent_col = _VERSIONED[scope]
+    table = VersionCounter.__table__
+    seed = (
+        select(func.coalesce(func.max(version_col), 0) + 1)
+        .where(parent_col == parent_id)
+        .scalar_subquery()
+    )
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        # No RETURNING: LAST_INSERT_ID(expr) stores the value, and the driver
+        # reads it back from the OK packet as lastrowid – still one round trip
+        stmt = mysql_insert(table).values(scope=scope, parent_id=parent_id, value=func.last_insert_id(seed))
+        stmt = stmt.on_duplicate_key_update(value=func.last_insert_id(table.c.value + 1))
+        return int(db.execute(stmt).lastrowid)
+
+    # PostgreSQL and SQLite (3.35+): ON CONFLICT ... RETURNING
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+    stmt = (
+        stmt.values(scope=scope, parent_id=parent_id, value=seed)
+        .on_conflict_do_update(index_elements=["scope", "parent_id"], set_={"value": table.c.value + 1})
+        .returning(table.c.value)
+    )
+    return db.execute(stmt).scalar_one()
@@ -1,22 +1,208 @@
 # app/database.py
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import settings
-
-# Create the engine
-engine = create_engine(
-    str(settings.db_url),
-    echo=True,               # log SQL for debugging; turn off in production
-    future=True              # use SQLAlchemy 2.0 style
+import threading
+from typing import AsyncIterator, Iterator, List, Optional
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from app.config import Settings, get_settings
+from app.db_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    instrument_engine,
 )
+from app.db_routing import ReplicaSet, RoutingSession
+
+# Base class for our ORM models (needs no engine, so importing models stays cheap)
+Base = declarative_base()
+
+def _pool_kwargs(settings: Settings, url: str, poolclass) -> dict:
+    # In-memory SQLite is pinned to one connection per thread; leave its pool alone
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+# ─── Async engine (opt-in via DB_ASYNC) ──────────────────────
+
+# Sync driver -> asyncio driver for the same backend
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+# ─── Lazy construction ───────────────────────────────────────
+# Nothing connects (or even parses DB_URL) at import: the engines are built by
+# init_db(), either called explicitly at startup or on first use.
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_pool_metrics: Optional[PoolMetrics] = None
+_async_pool_metrics: Optional[PoolMetrics] = None
+_replicas: Optional[ReplicaSet] = None
+_replica_pool_metrics: List[PoolMetrics] = []
+_init_lock = threading.RLock()
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that builds the engine the first time a session is made."""
+
+    def __call__(self, **local_kw) -> Session:
+        if "bind" not in local_kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    def __call__(self, **local_kw) -> AsyncSession:
+        if "bind" not in local_kw and get_async_engine() is None:
+            raise RuntimeError("Async database access is disabled; set DB_ASYNC=true")
+        return super().__call__(**local_kw)
+
 
-# Session factory
-SessionLocal = sessionmaker(
+# Session factories; bound by init_db(). Without replicas a RoutingSession
+# routes everything to its bind, like a plain Session.
+SessionLocal = _LazySessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine,
 )
 
-# Base class for our ORM models
-Base = declarative_base()
+# expire_on_commit=False: expired attributes cannot lazy-load outside the
+# greenlet once an AsyncSession commits
+AsyncSessionLocal = _LazyAsyncSessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+def init_db(settings: Optional[Settings] = None) -> Engine:
+    """
+    Build the engines from ``settings`` (default: the environment) and bind
+    the session factories to them. Call once at startup to fail fast on a bad
+    DB_URL; otherwise the first session does it. Calling again replaces the
+    engines and disposes the old sync pools.
+    """
+    global _engine, _async_engine, _pool_metrics, _async_pool_metrics, _replicas, _replica_pool_metrics
+    settings = settings or get_settings()
+    with _init_lock:
+        previous = [_engine] + (_replicas.engines if _replicas is not None else [])
+        url = str(settings.db_url)
+        engine = create_engine(
+            url,
+            echo=settings.db_echo,   # DB_ECHO=true logs every statement (debugging only)
+            future=True,             # use SQLAlchemy 2.0 style
+            **_pool_kwargs(settings, url, InstrumentedQueuePool),
+        )
+        pool_metrics = instrument_engine(engine, PoolMetrics())
+
+        # Read replicas for SessionLocal's RoutingSession (see app.db_routing)
+        replicas, replica_pool_metrics = None, []
+        replica_urls = [u.strip() for u in settings.db_replica_urls.split(",") if u.strip()]
+        if replica_urls:
+            replica_engines = [
+                create_engine(
+                    replica_url,
+                    echo=settings.db_echo,
+                    future=True,
+                    **_pool_kwargs(settings, replica_url, InstrumentedQueuePool),
+                )
+                for replica_url in replica_urls
+            ]
+            replica_pool_metrics = [instrument_engine(e, PoolMetrics()) for e in replica_engines]
+            replicas = ReplicaSet(
+                replica_engines,
+                retry_seconds=settings.db_replica_retry_seconds,
+                read_your_writes_seconds=settings.db_read_your_writes_seconds,
+            )
+
+        async_engine = async_pool_metrics = None
+        if settings.db_async:
+            async_url = settings.db_async_url or to_async_url(url)
+            async_engine = create_async_engine(
+                async_url,
+                echo=settings.db_echo,
+                **_pool_kwargs(settings, async_url, InstrumentedAsyncAdaptedQueuePool),
+            )
+            async_pool_metrics = instrument_engine(async_engine.sync_engine, PoolMetrics())
+
+        SessionLocal.configure(bind=engine, replicas=replicas)
+        AsyncSessionLocal.configure(bind=async_engine)
+        _engine, _async_engine = engine, async_engine
+        _pool_metrics, _async_pool_metrics = pool_metrics, async_pool_metrics
+        _replicas, _replica_pool_metrics = replicas, replica_pool_metrics
+    for old in previous:
+        if old is not None:
+            old.dispose()
+    return engine
+
+def get_engine() -> Engine:
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                init_db()
+    return _engine
+
+def get_replicas() -> Optional[ReplicaSet]:
+    """The read replicas, or None unless DB_REPLICA_URLS is set."""
+    get_engine()
+    return _replicas
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """The asyncio engine, or None unless DB_ASYNC is set."""
+    get_engine()
+    return _async_engine
+
+def __getattr__(name: str):
+    # The old module-level names, built on first access
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "pool_metrics":
+        get_engine()
+        return _pool_metrics
+    if name == "async_pool_metrics":
+        get_engine()
+        return _async_pool_metrics
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_pool_metrics() -> dict:
+    """Snapshot of pool counters and checkout latency for the configured engines."""
+    get_engine()
+    snapshot = {"sync": _pool_metrics.snapshot()}
+    if _async_pool_metrics is not None:
+        snapshot["async"] = _async_pool_metrics.snapshot()
+    for i, metrics in enumerate(_replica_pool_metrics):
+        snapshot[f"replica_{i}"] = metrics.snapshot()
+    return snapshot
+
+# ─── Request-scoped sessions (FastAPI dependencies) ──────────
+
+def get_db() -> Iterator[Session]:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,138 @@
+# app/db_metrics.py
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Checkout waits kept for the latency percentiles
+LATENCY_SAMPLES = 2048
+
+
+class PoolMetrics:
+    """Counters and checkout-latency samples for one engine's connection pool."""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self._lock = threading.Lock()
+        self._waits: Deque[float] = deque(maxlen=samples)
+        self.pool = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.overflow_events = 0   # connections opened beyond pool_size
+        self.timeouts = 0          # checkouts that gave up after pool_timeout
+        self.invalidations = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            counters = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+            }
+
+        def pct(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000.0
+
+        pool = self.pool
+        return {
+            **counters,
+            "pool_size": _call(pool, "size"),
+            "checked_out": _call(pool, "checkedout"),
+            "checked_in": _call(pool, "checkedin"),
+            "overflow": _call(pool, "overflow"),
+            "checkout_wait_ms": {
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": waits[-1] * 1000.0 if waits else None,
+                "samples": len(waits),
+            },
+        }
+
+
+def _call(pool, method: str) -> Optional[int]:
+    fn = getattr(pool, method, None)
+    return fn() if callable(fn) else None
+
+
+# ─── Pools that time how long a checkout waits ───────────────
+
+class _TimedCheckout:
+    _metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            if self._metrics is not None:
+                self._metrics.incr("timeouts")
+            raise
+        finally:
+            if self._metrics is not None:
+                self._metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting to the same metrics
+        pool = super().recreate()  # type: ignore[misc]
+        pool._metrics = self._metrics
+        if self._metrics is not None:
+            self._metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> PoolMetrics:
+    """Attach ``metrics`` to ``engine``'s pool through SQLAlchemy pool events."""
+    pool = engine.pool
+    metrics.pool = pool
+    if isinstance(pool, _TimedCheckout):
+        pool._metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+        # QueuePool counts overflow from -pool_size and bumps it before connecting
+        overflow = _call(metrics.pool, "overflow")
+        if overflow is not None and overflow > 0:
+            metrics.incr("overflow_events")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    return metrics
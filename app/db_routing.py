@@ -0,0 +1,207 @@
+# app/db_routing.py
+"""
+Read-replica routing for the sync Session.
+
+``RoutingSession.get_bind`` sends plain SELECTs to a replica and everything
+else to the primary. The replica is picked (round-robin over the healthy
+ones) at a transaction's first read and kept until it commits or rolls back,
+so reads that are matched up with each other (submissions and their
+responses, a question set and its options) see one replica's point in time,
+not several lagging by different amounts. The primary is used for:
+
+- INSERT / UPDATE / DELETE, ``text()`` statements and SELECT ... FOR UPDATE;
+- every statement during a flush;
+- every statement for the rest of a transaction that already wrote, so a
+  write transaction never mixes in replica reads;
+- reads inside the read-your-writes window that follows a commit which
+  wrote: per routing key (usually the user id, see ``set_routing_key``) so it
+  outlives the request's session, otherwise for the session itself;
+- reads inside ``with primary_reads(db):`` (read-modify-write that must not
+  see a lagging replica);
+- reads when no replica is healthy.
+
+Replicas that fail to connect (or drop a connection) are taken out of the
+rotation and probed again with ``SELECT 1`` every ``retry_seconds``.
+"""
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+# Expired read-your-writes entries are swept once the map grows past this
+_RECENT_WRITERS_SWEEP = 10_000
+
+
+class _Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.down_until: Optional[float] = None  # None: healthy
+
+
+class ReplicaSet:
+    """Replica engines in round-robin order, with health tracking and the read-your-writes windows."""
+
+    def __init__(self, engines: List[Engine], retry_seconds: float = 10.0, read_your_writes_seconds: float = 5.0):
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._replicas = [_Replica(engine) for engine in engines]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._recent_writers: Dict[Hashable, float] = {}
+        for replica in self._replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+
+    @property
+    def engines(self) -> List[Engine]:
+        return [replica.engine for replica in self._replicas]
+
+    # ─── Health ──────────────────────────────────────────────
+
+    def _on_error(self, replica: _Replica):
+        def handle_error(context) -> None:
+            # Failed connect (no connection yet) or a dropped one: stop routing here
+            if context.is_disconnect or context.connection is None:
+                self._mark_down(replica, context.original_exception)
+        return handle_error
+
+    def _mark_down(self, replica: _Replica, exc: BaseException) -> None:
+        with self._lock:
+            was_up = replica.down_until is None
+            replica.down_until = time.monotonic() + self.retry_seconds
+        if was_up:
+            logger.warning("Read replica %s marked down: %r", replica.engine.url, exc)
+
+    def _probe(self, replica: _Replica) -> bool:
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            self._mark_down(replica, exc)
+            return False
+        with self._lock:
+            replica.down_until = None
+        logger.info("Read replica %s is back in rotation", replica.engine.url)
+        return True
+
+    def check_health(self) -> Dict[str, bool]:
+        """Probe every replica now; returns url -> healthy."""
+        return {
+            replica.engine.url.render_as_string(hide_password=True): self._probe(replica)
+            for replica in self._replicas
+        }
+
+    def pick(self) -> Optional[Engine]:
+        """Next healthy replica in turn, or None when all are down."""
+        for _ in range(len(self._replicas)):
+            with self._lock:
+                replica = self._replicas[next(self._turn) % len(self._replicas)]
+                if replica.down_until is None:
+                    return replica.engine
+                if replica.down_until > time.monotonic():
+                    continue
+                # Due for a retry: push the deadline so only this caller probes it
+                replica.down_until = time.monotonic() + self.retry_seconds
+            if self._probe(replica):
+                return replica.engine
+        return None
+
+    # ─── Read-your-writes ────────────────────────────────────
+
+    def record_write(self, key: Hashable) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[key] = now + self.read_your_writes_seconds
+            if len(self._recent_writers) > _RECENT_WRITERS_SWEEP:
+                self._recent_writers = {k: t for k, t in self._recent_writers.items() if t > now}
+
+    def wrote_recently(self, key: Hashable) -> bool:
+        deadline = self._recent_writers.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+
+class RoutingSession(Session):
+    """Session that reads from replicas and writes to its bind (the primary)."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kw):
+        super().__init__(*args, **kw)
+        self.replicas = replicas
+        self._wrote = False                       # current transaction hit the primary for a write
+        self._primary_until = 0.0                 # this session's own read-your-writes window
+        self._primary_reads = 0                   # depth of primary_reads() blocks
+        self._read_bind: Optional[Engine] = None  # engine this transaction's reads are pinned to
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = super().get_bind(mapper, clause=clause, **kw)
+        if self.replicas is None:
+            return primary
+        is_read = (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+        )
+        if not is_read:
+            if clause is not None or self._flushing:
+                self._wrote = True
+            return primary
+        if self._wrote or self._primary_reads or self._in_read_your_writes_window():
+            return primary
+        if self._read_bind is None:
+            # Pinned for the transaction, the primary too when no replica was healthy
+            self._read_bind = self.replicas.pick() or primary
+        return self._read_bind
+
+    def _in_read_your_writes_window(self) -> bool:
+        if self._primary_until > time.monotonic():
+            return True
+        key = self.info.get("routing_key")
+        return key is not None and self.replicas.wrote_recently(key)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _open_read_your_writes_window(session: RoutingSession) -> None:
+    if not session._wrote or session.replicas is None:
+        return
+    session._wrote = False
+    session._primary_until = time.monotonic() + session.replicas.read_your_writes_seconds
+    key = session.info.get("routing_key")
+    if key is not None:
+        session.replicas.record_write(key)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _reset_write_flag(session: RoutingSession) -> None:
+    session._wrote = False
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _unpin_read_bind(session: RoutingSession, transaction) -> None:
+    # Commit, rollback or close: the next transaction picks a replica afresh
+    if transaction.parent is None:
+        session._read_bind = None
+
+
+def set_routing_key(db: Session, key: Hashable) -> None:
+    """Tie ``db`` to a caller (e.g. the user id) so its writes are read back from the primary in later sessions too."""
+    db.info["routing_key"] = key
+
+
+@contextmanager
+def primary_reads(db: Session) -> Iterator[Session]:
+    """Route every read in the block to the primary (no-op for a plain Session)."""
+    if not isinstance(db, RoutingSession):
+        yield db
+        return
+    db._primary_reads += 1
+    try:
+        yield db
+    finally:
+        db._primary_reads -= 1
@@ -0,0 +1,128 @@
+# app/exports.py
+"""
+Streaming export of every response of a QuestionSet, for offline analysis.
+
+Rows come straight from a Core select over submissions ⋈ responses ⋈ options ⋈
+users read through a server-side cursor (``yield_per``), are serialized one
+partition at a time and handed out as ``bytes`` chunks – optionally gzipped –
+so memory stays constant however many responses there are. The generator can
+back a streaming HTTP response directly::
+
+    StreamingResponse(export_responses(db, qs_id, fmt="csv", compress=True),
+                      media_type=export_media_type("csv", compress=True))
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Literal
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models import Option, Response, Submission, User
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Rows fetched from the server-side cursor (and serialized) per partition
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_COLUMNS = (
+    "submission_id",
+    "user_id",
+    "username",
+    "submitted_at",
+    "question_id",
+    "option_id",
+    "score",
+)
+
+
+def _export_query(question_set_id: int) -> Select:
+    # Ordered so each submission's responses are contiguous in the output
+    return (
+        select(
+            Submission.id.label("submission_id"),
+            Submission.user_id,
+            User.username,
+            Submission.submitted_at,
+            Response.question_id,
+            Response.option_id,
+            Option.score,
+        )
+        .join(Response, Response.submission_id == Submission.id)
+        .join(Option, Option.id == Response.option_id)
+        .join(User, User.id == Submission.user_id)
+        .where(Submission.question_set_id == question_set_id)
+        .order_by(Submission.id, Response.question_id, Response.id)
+    )
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson(rows: Iterable[tuple]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, map(_value, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+def _csv(rows: Iterable[tuple]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(tuple(map(_value, row)) for row in rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def _serialize(db: Session, question_set_id: int, fmt: ExportFormat, batch_size: int) -> Iterator[bytes]:
+    if fmt == "csv":
+        yield (",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
+        encode = _csv
+    elif fmt == "ndjson":
+        encode = _ndjson
+    else:
+        raise ValueError(f"Unsupported export format {fmt!r}")
+
+    # yield_per turns on stream_results: a server-side cursor on MySQL/Postgres
+    result = db.execute(_export_query(question_set_id).execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield encode(partition)
+    finally:
+        # Releases the cursor even when the consumer stops early (client disconnect)
+        result.close()
+
+
+def export_responses(
+    db: Session,
+    question_set_id: int,
+    fmt: ExportFormat = "ndjson",
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yield the responses of ``question_set_id`` as NDJSON or CSV chunks, one
+    per cursor partition; with ``compress`` the chunks form a single gzip stream.
+
+    The session's connection is busy with the open cursor until the generator
+    is exhausted or closed, so don't issue other queries on it meanwhile.
+    """
+    chunks = _serialize(db, question_set_id, fmt, batch_size)
+    if not compress:
+        yield from chunks
+        return
+
+    gz = zlib.compressobj(wbits=31)  # 16 + 15: gzip header and trailer
+    for chunk in chunks:
+        data = gz.compress(chunk)
+        if data:
+            yield data
+    yield gz.flush()
+
+
+def export_media_type(fmt: ExportFormat, compress: bool = False) -> str:
+    if compress:
+        return "application/gzip"
+    return "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
@@ -0,0 +1,270 @@
+# app/item_analysis.py
+"""
+Per-question option distributions and discrimination statistics.
+
+Two summary tables hold additive aggregates per (question set, question):
+``option_distributions`` counts responses per option, and
+``question_item_stats`` keeps running sums of the item score x, the total
+score y, x², y² and xy over submissions. Ingestion adds each batch's deltas
+with an upsert in the same transaction (``record_submissions``; autosave
+takes a submission's old answers out again as it adds the new ones), so reads
+(``get_item_analysis``) only touch summary rows. ``rebuild_question_set``
+recomputes a set from scratch for backfills::
+
+    python -m app.item_analysis rebuild 12 13
+    python -m app.item_analysis rebuild --all
+"""
+import argparse
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Option,
+    OptionDistribution,
+    Question,
+    QuestionItemStats,
+    QuestionSet,
+    Response,
+    Submission,
+    question_set_questions,
+)
+from app.schemas import OptionCountRead, QuestionItemAnalysis
+from app.scoring import score_question_set
+
+# (question_set_id, [(question_id, option_id), ...]) for one submission
+SubmissionResponses = Tuple[int, Sequence[Tuple[int, int]]]
+
+STAT_COLUMNS = ("n", "sum_item", "sum_item_sq", "sum_total", "sum_total_sq", "sum_item_total")
+
+# Max ids per IN (...) list
+IN_CHUNK_SIZE = 1000
+
+# ─── Incremental maintenance ─────────────────────────────────
+
+def _upsert_add(db: Session, table: Table, keys: Sequence[str], rows: List[dict]) -> None:
+    """INSERT rows, or add their values onto the existing row with the same key."""
+    if not rows:
+        return
+    # A consistent key order keeps concurrent batches from deadlocking on row locks
+    rows.sort(key=lambda r: tuple(r[k] for k in keys))
+    counters = [c for c in rows[0] if c not in keys]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in counters})
+    else:
+        # PostgreSQL and SQLite share the ON CONFLICT syntax
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={c: table.c[c] + stmt.excluded[c] for c in counters},
+        )
+    db.execute(stmt, rows)
+
+
+def record_submissions(
+    db: Session,
+    submissions: Sequence[SubmissionResponses],
+    replaced: Sequence[SubmissionResponses] = (),
+) -> None:
+    """
+    Fold newly written submissions into the summary tables; caller commits, so
+    the counts land atomically with the submissions themselves. ``replaced``
+    are earlier, already counted answer sheets of the same submissions, whose
+    contribution is subtracted (answers changed after ingestion). Two lookups
+    (the sets' questions and the options' scores) plus one upsert per table.
+    """
+    if not submissions and not replaced:
+        return
+    signed = [(1, sub) for sub in submissions] + [(-1, sub) for sub in replaced]
+    set_ids = sorted({qs_id for _, (qs_id, _) in signed})
+    option_ids = sorted({option_id for _, (_, responses) in signed for _, option_id in responses})
+
+    questions: Dict[int, List[int]] = defaultdict(list)
+    for qs_id, question_id in db.execute(
+        select(question_set_questions.c.question_set_id, question_set_questions.c.question_id)
+        .where(question_set_questions.c.question_set_id.in_(set_ids))
+    ):
+        questions[qs_id].append(question_id)
+
+    scores: Dict[int, int] = {}
+    for start in range(0, len(option_ids), IN_CHUNK_SIZE):
+        scores.update(db.execute(
+            select(Option.id, Option.score).where(Option.id.in_(option_ids[start:start + IN_CHUNK_SIZE]))
+        ).all())
+
+    counts: Counter = Counter()
+    stats: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0] * len(STAT_COLUMNS))
+    for sign, (qs_id, responses) in signed:
+        # Same rules as app.scoring: foreign questions ignored, repeats summed
+        items = dict.fromkeys(questions[qs_id], 0)
+        for question_id, option_id in responses:
+            if question_id in items:
+                counts[qs_id, question_id, option_id] += sign
+                items[question_id] += scores.get(option_id, 0)
+        total = sum(items.values())
+        for question_id, x in items.items():
+            s = stats[qs_id, question_id]
+            s[0] += sign
+            s[1] += sign * x
+            s[2] += sign * x * x
+            s[3] += sign * total
+            s[4] += sign * total * total
+            s[5] += sign * x * total
+
+    _upsert_add(
+        db, OptionDistribution.__table__, ("question_set_id", "question_id", "option_id"),
+        [
+            {"question_set_id": qs_id, "question_id": q_id, "option_id": o_id, "response_count": n}
+            for (qs_id, q_id, o_id), n in counts.items() if n
+        ],
+    )
+    _upsert_add(
+        db, QuestionItemStats.__table__, ("question_set_id", "question_id"),
+        [
+            {"question_set_id": qs_id, "question_id": q_id, **dict(zip(STAT_COLUMNS, sums))}
+            for (qs_id, q_id), sums in stats.items() if any(sums)
+        ],
+    )
+    if replaced:
+        # Options nobody picks any more
+        db.execute(
+            delete(OptionDistribution)
+            .where(OptionDistribution.question_set_id.in_(set_ids), OptionDistribution.response_count <= 0)
+        )
+
+# ─── Full rebuild ────────────────────────────────────────────
+
+def rebuild_question_set(db: Session, question_set_id: int) -> None:
+    """
+    Recompute both summaries of one set from the responses, in one transaction.
+    Submissions ingested while this runs may be counted twice or not at all;
+    run it on a quiet set, or re-run it afterwards.
+    """
+    try:
+        db.execute(delete(OptionDistribution).where(OptionDistribution.question_set_id == question_set_id))
+        db.execute(delete(QuestionItemStats).where(QuestionItemStats.question_set_id == question_set_id))
+
+        # Counts are a plain GROUP BY, done entirely in the database
+        in_set = (
+            select(question_set_questions.c.question_id)
+            .where(question_set_questions.c.question_set_id == question_set_id)
+        )
+        db.execute(
+            insert(OptionDistribution).from_select(
+                ["question_set_id", "question_id", "option_id", "response_count"],
+                select(Submission.question_set_id, Response.question_id, Response.option_id, func.count())
+                .join(Response, Response.submission_id == Submission.id)
+                .where(Submission.question_set_id == question_set_id, Response.question_id.in_(in_set))
+                .group_by(Submission.question_set_id, Response.question_id, Response.option_id),
+            )
+        )
+
+        # Item sums come from the vectorized scorer's (S, Q) score matrix
+        scores = score_question_set(db, question_set_id)
+        if len(scores.submission_ids):
+            x = scores.question_scores.astype(object)  # Python ints: no overflow
+            y = scores.totals.astype(object)[:, None]
+            columns = (
+                [len(scores.submission_ids)] * len(scores.question_ids),
+                x.sum(axis=0), (x * x).sum(axis=0),
+                [y.sum()] * len(scores.question_ids), [(y * y).sum()] * len(scores.question_ids),
+                (x * y).sum(axis=0),
+            )
+            db.execute(insert(QuestionItemStats), [
+                {
+                    "question_set_id": question_set_id,
+                    "question_id": int(q_id),
+                    **{name: int(col[j]) for name, col in zip(STAT_COLUMNS, columns)},
+                }
+                for j, q_id in enumerate(scores.question_ids)
+            ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+# ─── Query API ───────────────────────────────────────────────
+
+def _correlation(n: int, sx: int, sxx: int, sy: int, syy: int, sxy: int) -> Optional[float]:
+    # Exact integer arithmetic until the final division
+    var_x, var_y = n * sxx - sx * sx, n * syy - sy * sy
+    if var_x <= 0 or var_y <= 0:
+        return None
+    return (n * sxy - sx * sy) / math.sqrt(var_x * var_y)
+
+
+def get_item_analysis(db: Session, question_set_id: int) -> List[QuestionItemAnalysis]:
+    """Distribution and discrimination per question, read from the summary tables only."""
+    options: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for question_id, option_id, count in db.execute(
+        select(OptionDistribution.question_id, OptionDistribution.option_id, OptionDistribution.response_count)
+        .where(OptionDistribution.question_set_id == question_set_id)
+        .order_by(OptionDistribution.question_id, OptionDistribution.option_id)
+    ):
+        options[question_id].append((option_id, count))
+
+    rows = db.execute(
+        select(QuestionItemStats, Question.max_score)
+        .join(Question, Question.id == QuestionItemStats.question_id)
+        .where(QuestionItemStats.question_set_id == question_set_id)
+        .order_by(QuestionItemStats.question_id)
+    ).all()
+
+    analysis = []
+    for stats, max_score in rows:
+        n, sx, sxx, sy, syy, sxy = (getattr(stats, c) for c in STAT_COLUMNS)
+        answered = sum(count for _, count in options[stats.question_id])
+        mean = sx / n if n else None
+        analysis.append(QuestionItemAnalysis(
+            question_id=stats.question_id,
+            n=n,
+            mean_score=mean,
+            difficulty=mean / max_score if mean is not None and max_score else None,
+            std_score=math.sqrt(max(sxx / n - mean * mean, 0.0)) if n else None,
+            item_total_correlation=_correlation(n, sx, sxx, sy, syy, sxy),
+            # rest = total - item, expanded so it needs no extra sums
+            item_rest_correlation=_correlation(n, sx, sxx, sy - sx, syy - 2 * sxy + sxx, sxy - sxx),
+            options=[
+                OptionCountRead(option_id=o_id, count=count, percentage=count * 100.0 / answered)
+                for o_id, count in options[stats.question_id]
+            ],
+        ))
+    return analysis
+
+# ─── CLI ─────────────────────────────────────────────────────
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.item_analysis", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("rebuild", help="recompute the summaries from the responses")
+    rebuild.add_argument("question_set_ids", nargs="*", type=int)
+    rebuild.add_argument("--all", action="store_true", help="every question set")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        ids = args.question_set_ids
+        if args.all:
+            ids = db.execute(select(QuestionSet.id).order_by(QuestionSet.id)).scalars().all()
+        elif not ids:
+            parser.error("give question set ids or --all")
+        for qs_id in ids:
+            rebuild_question_set(db, qs_id)
+            print(f"rebuilt question set {qs_id}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # app/models.py
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
@@ -8,10 +9,43 @@ from sqlalchemy import (
     Table,
     UniqueConstraint,
     DateTime,
+    Float,
+    Index,
     func,
+    null,
+    true,
 )
-from sqlalchemy.orm import relationship, validates
-from app.database import Base, SessionLocal
+from itertools import chain
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, relationship
+from app.database import Base
+
+
+def _one_active_per(table: str, parent: Column, is_active: Column) -> tuple:
+    """
+    Unique index letting at most one row per ``parent`` value be active.
+    PostgreSQL/SQLite index only the active rows (partial index); MySQL has
+    no partial indexes, so it indexes IF(is_active, parent, NULL) – a
+    functional key part (8.0.13+) backed by a hidden generated column – and
+    the NULLs of inactive rows never collide.
+    """
+    name = f"uq_{table}_one_active"
+    return (
+        Index(name, func.if_(is_active, parent, null()), unique=True).ddl_if(dialect="mysql"),
+        Index(
+            name, parent, unique=True,
+            postgresql_where=is_active == true(),
+            sqlite_where=is_active == true(),
+        ).ddl_if(dialect=("postgresql", "sqlite")),
+    )
+
+
+def violates_one_active(exc: Exception, table: str, parent: str) -> bool:
+    """Whether an IntegrityError came from ``_one_active_per(table, ...)``."""
+    message = str(getattr(exc, "orig", exc))
+    # MySQL and PostgreSQL name the index; SQLite names the indexed column
+    return f"uq_{table}_one_active" in message or message.endswith(f"UNIQUE constraint failed: {table}.{parent}")
 
 # Association table for QuestionSet ↔ Question (M2M)
 question_set_questions = Table(
@@ -69,9 +103,6 @@ class AssessmentType(Base):
 
 class Assessment(Base):
     __tablename__ = "assessments"
-    __table_args__ = (
-        UniqueConstraint("type_id", "version", name="uq_assessment_type_version"),
-    )
 
     id          = Column(Integer, primary_key=True, index=True)
     title       = Column(String(200), nullable=False)
@@ -85,19 +116,12 @@ class Assessment(Base):
 
     question_sets = relationship("QuestionSet", back_populates="assessment")
 
-    @validates("is_active")
-    def _validate_single_active(self, key, value):
-        if value:
-            session = SessionLocal()
-            existing = (
-                session.query(Assessment)
-                       .filter_by(type_id=self.type_id, is_active=True)
-                       .first()
-            )
-            session.close()
-            if existing and existing is not self:
-                raise ValueError("There is already an active Assessment for this AssessmentType")
-        return value
+    __table_args__ = (
+        UniqueConstraint("type_id", "version", name="uq_assessment_type_version"),
+        Index("ix_assessments_type_id_is_active", "type_id", "is_active"),
+        *_one_active_per("assessments", type_id, is_active),
+    )
+
 
 class QuestionSet(Base):
     __tablename__ = "question_sets"
@@ -119,6 +143,12 @@ class QuestionSet(Base):
     # Submissions against this set
     submissions = relationship("Submission", back_populates="question_set", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        UniqueConstraint("assessment_id", "version", name="uq_question_set_assessment_version"),
+        Index("ix_question_sets_assessment_id_is_active", "assessment_id", "is_active"),
+        *_one_active_per("question_sets", assessment_id, is_active),
+    )
+
 
 class Question(Base):
     __tablename__ = "questions"
@@ -134,8 +164,8 @@ class Question(Base):
         back_populates="questions",
     )
 
-    # Versioned OptionSets
-    option_sets = relationship("OptionSet", back_populates="question")
+    # Versioned OptionSets, in id order (as app.serialization emits them)
+    option_sets = relationship("OptionSet", back_populates="question", order_by="OptionSet.id")
 
 
 class OptionSet(Base):
@@ -149,23 +179,12 @@ class OptionSet(Base):
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     question = relationship("Question", back_populates="option_sets")
 
-    options = relationship("Option", back_populates="option_set")
+    options = relationship("Option", back_populates="option_set", order_by="Option.id")
 
-    @validates("is_active")
-    def _validate_single_active(self, key, value):
-        if value:
-            session = SessionLocal()
-            existing = (
-                session.query(OptionSet)
-                .filter_by(question_id=self.question_id, is_active=True)
-                .first()
-            )
-            session.close()
-            if existing and existing is not self:
-                raise ValueError(
-                    "There is already an active OptionSet for this Question"
-                )
-        return value
+    __table_args__ = (
+        Index("ix_option_sets_question_id_is_active", "question_id", "is_active"),
+        *_one_active_per("option_sets", question_id, is_active),
+    )
 
 
 class Option(Base):
@@ -178,19 +197,6 @@ class Option(Base):
     option_set_id = Column(Integer, ForeignKey("option_sets.id"), nullable=False)
     option_set = relationship("OptionSet", back_populates="options")
 
-    @validates("score")
-    def validate_score(self, key, value):
-        session = SessionLocal()
-        question = session.get(Question, self.option_set.question_id)
-        session.close()
-        if question is None:
-            raise ValueError("Parent Question not found for this OptionSet")
-        if value > question.max_score:
-            raise ValueError(
-                f"Option score {value} exceeds question’s max_score {question.max_score}"
-            )
-        return value
-
 
 class Submission(Base):
     __tablename__ = "submissions"
@@ -206,10 +212,17 @@ class Submission(Base):
     user = relationship("User", back_populates="submissions")
     question_set = relationship("QuestionSet", back_populates="submissions")
     responses = relationship("Response", back_populates="submission", cascade="all, delete-orphan")
+    score = relationship("SubmissionScore", back_populates="submission", uselist=False, cascade="all, delete-orphan")
 
 
 class Response(Base):
     __tablename__ = "responses"
+    __table_args__ = (
+        # One answer per question: autosave upserts on this key (it also serves
+        # lookups by submission_id, its leading column)
+        UniqueConstraint("submission_id", "question_id", name="uq_response_submission_question"),
+        Index("ix_responses_question_id_option_id", "question_id", "option_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False)
@@ -220,3 +233,145 @@ class Response(Base):
     question = relationship("Question")
     option = relationship("Option")
 
+
+class SubmissionScore(Base):
+    __tablename__ = "submission_scores"
+
+    # One row per submission: written "pending" at finalization, filled in by the scoring workers
+    submission_id = Column(Integer, ForeignKey("submissions.id", ondelete="CASCADE"), primary_key=True)
+    question_set_id = Column(Integer, ForeignKey("question_sets.id"), nullable=False, index=True)
+    status = Column(String(16), nullable=False, default="pending", index=True)  # pending | scored | failed
+    total_score = Column(Integer, nullable=True)
+    max_score = Column(Integer, nullable=True)
+    percentage = Column(Float, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(String(500), nullable=True)
+    queued_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    scored_at = Column(DateTime(timezone=True), nullable=True)
+
+    submission = relationship("Submission", back_populates="score")
+
+
+class VersionCounter(Base):
+    __tablename__ = "version_counters"
+
+    # Last version handed out per (scope, parent); see app.crud.version_counter
+    scope = Column(String(32), primary_key=True)
+    parent_id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False)
+
+
+# ─── Item analysis summaries ─────────────────────────────────
+# Additive aggregates, bumped by each ingested submission (app.item_analysis);
+# reading them never touches the responses table.
+
+class OptionDistribution(Base):
+    __tablename__ = "option_distributions"
+
+    question_set_id = Column(Integer, ForeignKey("question_sets.id", ondelete="CASCADE"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
+    option_id = Column(Integer, ForeignKey("options.id"), primary_key=True)
+    response_count = Column(BigInteger, nullable=False, default=0)
+
+
+class QuestionItemStats(Base):
+    __tablename__ = "question_item_stats"
+
+    # Running sums over submissions of item score x and total score y; enough
+    # for mean, variance and the item-total / item-rest correlations
+    question_set_id = Column(Integer, ForeignKey("question_sets.id", ondelete="CASCADE"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
+    n = Column(BigInteger, nullable=False, default=0)
+    sum_item = Column(BigInteger, nullable=False, default=0)
+    sum_item_sq = Column(BigInteger, nullable=False, default=0)
+    sum_total = Column(BigInteger, nullable=False, default=0)
+    sum_total_sq = Column(BigInteger, nullable=False, default=0)
+    sum_item_total = Column(BigInteger, nullable=False, default=0)
+
+
+# ─── Flush-time validation ───────────────────────────────────
+# Runs once per flush on the flushing session's own connection and checks every
+# pending object of a kind with at most one query, instead of opening a new
+# SessionLocal() each time an attribute is set.
+
+def _changed(obj, *attrs) -> bool:
+    state = inspect(obj)
+    return state.pending or any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+def _check_single_active(session: Session, cls, parent_attr: str, message: str) -> None:
+    activating = [
+        obj for obj in chain(session.new, session.dirty)
+        if isinstance(obj, cls) and obj.is_active and _changed(obj, "is_active", parent_attr)
+    ]
+
+    # Conflicts with stored rows are caught by the uq_<table>_one_active index;
+    # only two rows activated in the same flush need checking here
+    by_parent = {}
+    for obj in activating:
+        parent_id = getattr(obj, parent_attr)
+        if by_parent.setdefault(parent_id, obj) is not obj:
+            raise ValueError(message)
+
+
+def _check_option_scores(session: Session) -> None:
+    options = [
+        obj for obj in chain(session.new, session.dirty)
+        if isinstance(obj, Option) and _changed(obj, "score", "option_set_id", "option_set")
+    ]
+    if not options:
+        return
+
+    # Resolve each option to its question without triggering lazy loads:
+    # an attached (possibly pending) OptionSet gives question_id directly,
+    # otherwise option_set_id is looked up in one batched query.
+    question_of = {}
+    option_set_ids = set()
+    for opt in options:
+        option_set = inspect(opt).dict.get("option_set")
+        if option_set is not None:
+            question_of[id(opt)] = option_set.question_id
+        else:
+            option_set_ids.add(opt.option_set_id)
+
+    max_scores = {}
+    if option_set_ids:
+        rows = session.execute(
+            select(OptionSet.id, Question.id, Question.max_score)
+            .join(Question, Question.id == OptionSet.question_id)
+            .where(OptionSet.id.in_(list(option_set_ids)))
+        ).all()
+        set_question = {os_id: q_id for os_id, q_id, _ in rows}
+        max_scores.update({q_id: max_score for _, q_id, max_score in rows})
+        for opt in options:
+            if id(opt) not in question_of:
+                question_of[id(opt)] = set_question.get(opt.option_set_id)
+
+    missing = {q_id for q_id in question_of.values() if q_id is not None} - set(max_scores)
+    if missing:
+        rows = session.execute(
+            select(Question.id, Question.max_score).where(Question.id.in_(list(missing)))
+        ).all()
+        max_scores.update({q_id: max_score for q_id, max_score in rows})
+
+    for opt in options:
+        max_score = max_scores.get(question_of[id(opt)])
+        if max_score is None:
+            raise ValueError("Parent Question not found for this OptionSet")
+        if opt.score is not None and opt.score > max_score:
+            raise ValueError(
+                f"Option score {opt.score} exceeds question’s max_score {max_score}"
+            )
+
+
+@event.listens_for(Session, "before_flush")
+def _validate_flush(session: Session, flush_context, instances) -> None:
+    _check_single_active(
+        session, Assessment, "type_id",
+        "There is already an active Assessment for this AssessmentType",
+    )
+    _check_single_active(
+        session, OptionSet, "question_id",
+        "There is already an active OptionSet for this Question",
+    )
+    _check_option_scores(session)
@@ -0,0 +1,102 @@
+# app/pagination.py
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with ``WHERE (k1, k2) > (:last_k1, :last_k2) ORDER BY k1, k2
+LIMIT :n`` on indexed key columns, so page 10 000 costs the same as page 1
+(unlike OFFSET, which scans and discards every skipped row). The position is
+handed to clients as an opaque, URL-safe cursor.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Row, Select, and_, or_
+from sqlalchemy.orm import Query, Session
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]  # None on the last page
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, width: int) -> Tuple[Any, ...]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed pagination cursor") from exc
+    if not isinstance(values, list) or len(values) != width:
+        raise InvalidCursor("Pagination cursor does not match this listing")
+    return tuple(values)
+
+
+def _after(keys: Sequence, values: Sequence, descending: bool):
+    # Row-value comparison spelled out as OR/AND so MySQL uses the index range
+    # (k1 > v1) OR (k1 = v1 AND k2 > v2) ...
+    clauses = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        step = key < value if descending else key > value
+        clauses.append(and_(*[k == v for k, v in zip(keys[:i], values[:i])], step))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    keys: Sequence,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = False,
+) -> Page:
+    """
+    Return one page of ``query`` ordered by ``keys`` (which must be unique
+    together, e.g. ``(Model.id,)`` or ``(Model.version, Model.id)``).
+    """
+    query, limit = _window(query, keys, cursor, limit, descending)
+    return _page(query.all(), keys, limit)
+
+
+def paginate_select(
+    db: Session,
+    stmt: Select,
+    keys: Sequence,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = False,
+) -> Page[Row]:
+    """:func:`paginate` for a Core ``select()``: items are ``Row`` tuples, no ORM instances."""
+    stmt, limit = _window(stmt, keys, cursor, limit, descending)
+    return _page(db.execute(stmt).all(), keys, limit)
+
+
+def _window(query, keys: Sequence, cursor: Optional[str], limit: int, descending: bool):
+    # Query and Select share filter/order_by/limit
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor is not None:
+        query = query.filter(_after(keys, decode_cursor(cursor, len(keys)), descending))
+    order = [k.desc() for k in keys] if descending else list(keys)
+    return query.order_by(*order).limit(limit + 1), limit
+
+
+def _page(rows: list, keys: Sequence, limit: int) -> Page:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, k.key) for k in keys])
+    return Page(items=rows, next_cursor=next_cursor)
@@ -1,9 +1,88 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config import get_settings
+
+@lru_cache(maxsize=None)
+def _pwd_context() -> CryptContext:
+    # Built on first use (and once per worker process), not at import.
+    # min == max == default: hashes made with any other cost report needs_update,
+    # so they are upgraded (or downgraded) on the next successful login
+    rounds = get_settings().bcrypt_rounds
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and return a fresh hash when the stored one uses outdated cost settings."""
+    return _pwd_context().verify_and_update(plain_password, hashed_password)
+
+def dummy_verify() -> None:
+    """Spend one verify's worth of time, so unknown users can't be told apart by latency."""
+    _pwd_context().dummy_verify()
+
+# ─── Process pool ───────────────────────────────────────────
+# bcrypt holds the GIL for its whole ~250ms, so threads don't help: hashing runs
+# in a bounded pool of worker processes and callers await or batch on it.
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _worker_count() -> int:
+    return get_settings().password_hash_workers or os.cpu_count() or 1
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_worker_count())
+        return _executor
+
+def shutdown_hash_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), verify_password, plain_password, hashed_password)
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), verify_and_update, plain_password, hashed_password)
+
+async def dummy_verify_async() -> None:
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_get_executor(), dummy_verify)
+
+def hash_passwords(passwords: Iterable[str]) -> List[str]:
+    """Hash many passwords in parallel across the worker processes, preserving order."""
+    passwords = list(passwords)
+    # A few chunks per worker: amortizes IPC without leaving workers idle on small batches
+    chunksize = max(1, len(passwords) // (_worker_count() * 4))
+    return list(_get_executor().map(get_password_hash, passwords, chunksize=chunksize))
+
+async def hash_passwords_async(passwords: Iterable[str]) -> List[str]:
+    return await asyncio.gather(*(hash_password_async(p) for p in passwords))
@@ -0,0 +1,165 @@
+# app/query_counter.py
+"""
+Per-request / per-scope SQL statement counting and N+1 detection.
+
+Every statement executed on any engine is attributed to the active
+:func:`query_scope` (scopes nest; outer scopes see inner statements too).
+Statements are grouped by *shape* – the SQL with parameters and IN-lists
+collapsed – so the same lazy load fired once per row shows up as one shape
+repeated many times.
+
+In tests::
+
+    with assert_query_budget(3):
+        crud.question_set.get_question_set(db, 1)
+
+Every crud function has such a budget in benchmarks/cases.py (``budget=``),
+checked on each call by ``python -m benchmarks.run``.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Same shape executed at least this many times in one scope is reported as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+_active_scopes: ContextVar[Tuple["QueryScope", ...]] = ContextVar("query_scopes", default=())
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|:\w+|%\(\w+\)s))*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize SQL so executions that differ only in parameters compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _PARAM_LIST.sub("(?)", shape)
+
+
+class QueryScope:
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.shape_seconds: Dict[str, float] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[shape] += 1
+        self.shape_seconds[shape] = self.shape_seconds.get(shape, 0.0) + seconds
+
+    def n_plus_one_suspects(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Shapes of SELECTs executed ``threshold`` or more times, most frequent first."""
+        return [
+            (shape, n) for shape, n in self.shapes.most_common()
+            if n >= threshold and shape.upper().startswith("SELECT")
+        ]
+
+    def report(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, Any]:
+        return {
+            "scope": self.name,
+            "queries": self.count,
+            "total_ms": round(self.total_seconds * 1000.0, 3),
+            "distinct_shapes": len(self.shapes),
+            "n_plus_one": [
+                {"statement": shape, "count": n, "total_ms": round(self.shape_seconds[shape] * 1000.0, 3)}
+                for shape, n in self.n_plus_one_suspects(threshold)
+            ],
+        }
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_scope(name: str = "scope") -> Iterator[QueryScope]:
+    scope = QueryScope(name)
+    token = _active_scopes.set(_active_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _active_scopes.reset(token)
+
+
+@contextmanager
+def assert_query_budget(
+    max_queries: int,
+    allow_n_plus_one: bool = False,
+    threshold: int = N_PLUS_ONE_THRESHOLD,
+    name: str = "budget",
+) -> Iterator[QueryScope]:
+    """Fail if the block issues more than ``max_queries`` statements or looks like N+1."""
+    with query_scope(name) as scope:
+        yield scope
+    if scope.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{name}: {scope.count} queries issued, budget is {max_queries}\n{scope.report(threshold)}"
+        )
+    if not allow_n_plus_one and scope.n_plus_one_suspects(threshold):
+        raise QueryBudgetExceeded(f"{name}: repeated statements look like N+1\n{scope.report(threshold)}")
+
+
+# ─── Engine-wide listeners ───────────────────────────────────
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-statement context, not conn.info: a statement that fails
+    # never reaches after_cursor_execute and must not leave state on the connection
+    if _active_scopes.get() and context is not None:
+        context._query_counter_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    scopes = _active_scopes.get()
+    start = getattr(context, "_query_counter_start", None)
+    if not scopes or start is None:
+        return
+    elapsed = time.perf_counter() - start
+    for scope in scopes:
+        scope.record(statement, elapsed)
+
+
+# ─── ASGI middleware: one scope per HTTP request ─────────────
+
+class QueryCountMiddleware:
+    """Wrap each HTTP request in a query scope and log suspected N+1 patterns."""
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD, header: Optional[str] = "x-query-count"):
+        self.app = app
+        self.threshold = threshold
+        self.header = header.encode() if header else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with query_scope(f"{scope.get('method')} {scope.get('path')}") as queries:
+            async def send_with_count(message):
+                if self.header and message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((self.header, str(queries.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
+
+        if queries.n_plus_one_suspects(self.threshold):
+            logger.warning("Possible N+1 queries: %s", queries.report(self.threshold))
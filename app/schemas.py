@@ -1,6 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
+from typing import Any, Iterable, List, Literal, Optional
 
 
 # ─── AssesmentType Schemas ─────────────────────────────────────────────────────────────────
@@ -14,13 +13,10 @@ class AssessmentTypeCreate(AssessmentTypeBase):
 class AssessmentTypeRead(AssessmentTypeBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ─── UserGroup Schemas ─────────────────────────────────────────────────────────────────
 
-from pydantic import BaseModel
-
 class UserGroupBase(BaseModel):
     name: str
     assessment_type_id: int
@@ -31,16 +27,11 @@ class UserGroupCreate(UserGroupBase):
 class UserGroupRead(UserGroupBase):
     id: int  # Additional field for reading data
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ─── User Schemas ─────────────────────────────────────────────────────────────────
 
-from pydantic import BaseModel, EmailStr
-from typing import Optional
-from .schemas import UserGroupRead
-
 class UserBase(BaseModel):
     username: str
     email: EmailStr
@@ -54,8 +45,14 @@ class UserRead(UserBase):
     id: int
     group: UserGroupRead  # Nested schema to include group details
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class UserImportResult(BaseModel):
+    row: int  # line number in the CSV (header is line 1)
+    status: Literal["created", "duplicate", "invalid"]
+    username: Optional[str] = None
+    email: Optional[str] = None
+    detail: Optional[str] = None
 
 # ─── Assesment Schemas ─────────────────────────────────────────────────────────────────
 
@@ -73,37 +70,55 @@ class AssessmentRead(AssessmentBase):
     is_active: bool
     type: AssessmentTypeRead
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 
-# ─── Question set Schemas ─────────────────────────────────────────────────────────────────
+# ─── Option / OptionSet Schemas ─────────────────────────────────────────────────────────────────
+
+class OptionBase(BaseModel):
+    text: str
+    score: int
 
-from pydantic import BaseModel
-from typing import List, Optional
-from .schemas import QuestionRead  # Ensure QuestionRead is already defined
+class OptionCreate(OptionBase):
+    option_set_id: int
 
-class QuestionSetBase(BaseModel):
-    assessment_id: int
+class OptionRead(OptionBase):
+    id: int
+    option_set_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class OptionSetBase(BaseModel):
+    question_id: int
     version: int
-    is_active: Optional[bool] = False
+    is_active: bool = False
 
-class QuestionSetCreate(BaseModel):
-    assessment_id: int
-    question_ids: List[int]
+class OptionSetCreate(OptionSetBase):
+    parent_id: Optional[int] = None  # the OptionSet this version was derived from
+    options: List[OptionBase] = []
 
-class QuestionSetRead(QuestionSetBase):
+class OptionSetRead(OptionSetBase):
     id: int
-    questions: List[QuestionRead]
+    parent_id: Optional[int] = None
+    options: List[OptionRead]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
-# ─── Question Schemas ─────────────────────────────────────────────────────────────────
+class OptionRescore(BaseModel):
+    text: str
+    old_score: int
+    new_score: int
+
+class OptionSetDiff(BaseModel):
+    from_id: int
+    to_id: int
+    added: List[OptionBase] = []
+    removed: List[OptionBase] = []
+    rescored: List[OptionRescore] = []
 
-from pydantic import BaseModel
-from typing import List, Any  # Temporarily using Any for option_sets
+
+# ─── Question Schemas ─────────────────────────────────────────────────────────────────
 
 class QuestionBase(BaseModel):
     text: str
@@ -114,8 +129,82 @@ class QuestionCreate(QuestionBase):
 
 class QuestionRead(QuestionBase):
     id: int
-    option_sets: List[Any]  # Replace Any with OptionSetRead once it's defined
+    option_sets: List[OptionSetRead]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ─── Question set Schemas ─────────────────────────────────────────────────────────────────
 
-    class Config:
-        orm_mode = True
+class QuestionSetBase(BaseModel):
+    assessment_id: int
+    version: int
+    is_active: Optional[bool] = False
+
+class QuestionSetCreate(BaseModel):
+    assessment_id: int
+    question_ids: List[int]
+
+class QuestionSetDerive(BaseModel):
+    base_question_set_id: int
+    add_question_ids: List[int] = []
+    remove_question_ids: List[int] = []
+
+class QuestionSetRead(QuestionSetBase):
+    id: int
+    questions: List[QuestionRead]
 
+    model_config = ConfigDict(from_attributes=True)
+
+# ─── Submission Schemas ─────────────────────────────────────────────────────────────────
+
+class ResponseCreate(BaseModel):
+    question_id: int
+    option_id: int
+
+class SubmissionCreate(BaseModel):
+    user_id: int
+    question_set_id: int
+    responses: List[ResponseCreate]
+
+class SubmissionIngestResult(BaseModel):
+    index: int  # position of the submission in the ingested batch
+    user_id: int
+    question_set_id: int
+    status: Literal["created", "conflict", "invalid"]
+    submission_id: Optional[int] = None
+    detail: Optional[str] = None
+
+# ─── Item analysis Schemas ─────────────────────────────────────────────────────────────────
+
+class OptionCountRead(BaseModel):
+    option_id: int
+    count: int
+    percentage: float  # share of this question's responses
+
+class QuestionItemAnalysis(BaseModel):
+    question_id: int
+    n: int  # submissions counted; unanswered questions score 0
+    mean_score: Optional[float] = None
+    difficulty: Optional[float] = None  # mean score / max_score
+    std_score: Optional[float] = None
+    item_total_correlation: Optional[float] = None
+    item_rest_correlation: Optional[float] = None  # total without this item
+    options: List[OptionCountRead] = []
+
+# ─── List serializers ─────────────────────────────────────────────────────────────────
+# Built once at import, so listing endpoints don't rebuild a validator/serializer
+# per request and the whole ORM rows -> JSON step runs inside pydantic-core.
+
+AssessmentTypeReadList = TypeAdapter(List[AssessmentTypeRead])
+UserGroupReadList = TypeAdapter(List[UserGroupRead])
+UserReadList = TypeAdapter(List[UserRead])
+AssessmentReadList = TypeAdapter(List[AssessmentRead])
+OptionReadList = TypeAdapter(List[OptionRead])
+OptionSetReadList = TypeAdapter(List[OptionSetRead])
+QuestionReadList = TypeAdapter(List[QuestionRead])
+QuestionSetReadList = TypeAdapter(List[QuestionSetRead])
+
+def dump_json_list(adapter: TypeAdapter, objs: Iterable[Any]) -> bytes:
+    """ORM objects -> JSON bytes through one of the list adapters above."""
+    return adapter.dump_json(adapter.validate_python(list(objs), from_attributes=True))
@@ -0,0 +1,156 @@
+# app/scoring.py
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Option, Question, Response, Submission, question_set_questions
+
+# Responses are streamed from the cursor in partitions of this many rows
+FETCH_BATCH_SIZE = 50_000
+# Max ids per IN (...) list when fetching option scores
+IN_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class QuestionSetScores:
+    """
+    Scores of every submission of one QuestionSet, laid out as arrays.
+
+    Row ``i`` of every per-submission array belongs to ``submission_ids[i]``;
+    column ``j`` of ``question_scores`` belongs to ``question_ids[j]``.
+    """
+    question_set_id: int
+    submission_ids: np.ndarray          # (S,)   ascending
+    question_ids: np.ndarray            # (Q,)   ascending
+    max_scores: np.ndarray              # (Q,)   Question.max_score
+    question_scores: np.ndarray         # (S, Q) summed Option.score per question
+    totals: np.ndarray                  # (S,)
+    question_percentages: np.ndarray    # (S, Q) question_scores / max_scores * 100
+    percentages: np.ndarray             # (S,)   totals / sum(max_scores) * 100
+
+    def for_submission(self, submission_id: int) -> Dict:
+        row = int(np.searchsorted(self.submission_ids, submission_id))
+        if row >= len(self.submission_ids) or self.submission_ids[row] != submission_id:
+            raise KeyError(submission_id)
+        return {
+            "submission_id": submission_id,
+            "total": int(self.totals[row]),
+            "percentage": float(self.percentages[row]),
+            "questions": {
+                int(qid): {
+                    "score": int(self.question_scores[row, col]),
+                    "max_score": int(self.max_scores[col]),
+                    "percentage": float(self.question_percentages[row, col]),
+                }
+                for col, qid in enumerate(self.question_ids)
+            },
+        }
+
+
+def _int_column(db: Session, stmt) -> np.ndarray:
+    return np.fromiter(db.execute(stmt).scalars(), dtype=np.int64)
+
+
+def _fetch_responses(db: Session, stmt) -> np.ndarray:
+    """Stream (submission_id, question_id, option_id) rows into an (N, 3) array."""
+    result = db.execute(stmt, execution_options={"yield_per": FETCH_BATCH_SIZE})
+    parts = [
+        np.fromiter(chain.from_iterable(partition), dtype=np.int64).reshape(-1, 3)
+        for partition in result.partitions()
+    ]
+    if not parts:
+        return np.empty((0, 3), dtype=np.int64)
+    return np.concatenate(parts)
+
+
+def _option_score_lookup(db: Session, option_ids: np.ndarray) -> np.ndarray:
+    """Dense array indexed by Option.id; ids that don't exist score 0."""
+    lookup = np.zeros(int(option_ids.max()) + 1 if option_ids.size else 1, dtype=np.int64)
+    ids = option_ids.tolist()
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        rows = db.execute(
+            select(Option.id, Option.score).where(Option.id.in_(ids[start:start + IN_CHUNK_SIZE]))
+        ).all()
+        if rows:
+            found = np.array(rows, dtype=np.int64)
+            lookup[found[:, 0]] = found[:, 1]
+    return lookup
+
+
+def _percent(part: np.ndarray, whole: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(whole > 0, part * 100.0 / whole, 0.0)
+
+
+# ─── Score a whole QuestionSet in one pass ───────────────────
+
+def score_question_set(
+    db: Session,
+    question_set_id: int,
+    submission_ids: Optional[Sequence[int]] = None,
+) -> QuestionSetScores:
+    """
+    Compute totals, per-question scores and percentages for every submission
+    of ``question_set_id`` (or only ``submission_ids`` of it).
+
+    Runs a fixed number of queries regardless of volume: the set's questions,
+    its submissions, the responses as a streamed columnar fetch, and the
+    scores of the distinct options referenced. The join and all sums happen
+    in NumPy. Responses to questions outside the set are ignored; repeated
+    responses to the same question are summed.
+    """
+    questions = db.execute(
+        select(Question.id, Question.max_score)
+        .join(question_set_questions, question_set_questions.c.question_id == Question.id)
+        .where(question_set_questions.c.question_set_id == question_set_id)
+        .order_by(Question.id)
+    ).all()
+    question_arr = np.array(questions, dtype=np.int64).reshape(-1, 2)
+    question_ids, max_scores = question_arr[:, 0], question_arr[:, 1]
+
+    sub_stmt = select(Submission.id).where(Submission.question_set_id == question_set_id)
+    resp_stmt = (
+        select(Response.submission_id, Response.question_id, Response.option_id)
+        .join(Submission, Submission.id == Response.submission_id)
+        .where(Submission.question_set_id == question_set_id)
+    )
+    if submission_ids is not None:
+        sub_stmt = sub_stmt.where(Submission.id.in_(list(submission_ids)))
+        resp_stmt = resp_stmt.where(Submission.id.in_(list(submission_ids)))
+    subs = np.sort(_int_column(db, sub_stmt))
+
+    responses = _fetch_responses(db, resp_stmt)
+    resp_sub, resp_q, resp_opt = responses[:, 0], responses[:, 1], responses[:, 2]
+
+    # Map question ids to columns, dropping responses for foreign questions
+    q_col = np.searchsorted(question_ids, resp_q)
+    in_set = q_col < len(question_ids)
+    in_set[in_set] = question_ids[q_col[in_set]] == resp_q[in_set]
+    resp_sub, resp_opt, q_col = resp_sub[in_set], resp_opt[in_set], q_col[in_set]
+
+    lookup = _option_score_lookup(db, np.unique(resp_opt))
+    resp_scores = lookup[resp_opt]
+
+    n_subs, n_questions = len(subs), len(question_ids)
+    sub_row = np.searchsorted(subs, resp_sub)
+    question_scores = np.bincount(
+        sub_row * n_questions + q_col,
+        weights=resp_scores,
+        minlength=n_subs * n_questions,
+    ).astype(np.int64).reshape(n_subs, n_questions)
+    totals = question_scores.sum(axis=1)
+
+    return QuestionSetScores(
+        question_set_id=question_set_id,
+        submission_ids=subs,
+        question_ids=question_ids,
+        max_scores=max_scores,
+        question_scores=question_scores,
+        totals=totals,
+        question_percentages=_percent(question_scores, max_scores[np.newaxis, :]),
+        percentages=_percent(totals, np.full(n_subs, max_scores.sum())),
+    )
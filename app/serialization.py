@@ -0,0 +1,140 @@
+# app/serialization.py
+"""
+List endpoints straight from Core rows to JSON bytes.
+
+The ORM path builds an ORM instance, a pydantic model and a dict per row
+before anything is encoded (and lazy-loads nested relationships one row at a
+time). Here each listing selects exactly the columns of its Read schema,
+labelled with the field names, fetches nested collections with one IN query
+per level, and ``pydantic_core.to_json`` encodes the plain dicts in one
+call. Keys come out in the Read schema's field order, so the bytes match
+``schemas.dump_json_list(<Read>List, page.items)`` of the ORM path
+(benchmarks/serialization.py checks this and times both).
+
+Every function returns ``{"items": [...], "next_cursor": ...}`` for the same
+keyset page as the matching ``get_*_page`` crud function.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Type, get_origin
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.pagination import paginate_select
+
+
+def _is_nested(annotation: Any) -> bool:
+    return get_origin(annotation) is list or (isinstance(annotation, type) and issubclass(annotation, BaseModel))
+
+
+def _columns(schema: Type[BaseModel], model, prefix: str = "") -> list:
+    """``model`` columns for the scalar fields of ``schema``, labelled ``prefix + field``."""
+    return [
+        getattr(model, name).label(prefix + name)
+        for name, field in schema.model_fields.items()
+        if not _is_nested(field.annotation)
+    ]
+
+
+def _item(schema: Type[BaseModel], row: Row, nested: Optional[Dict[str, Any]] = None, prefix: str = "") -> dict:
+    """One JSON object in ``schema`` field order; nested fields are taken from ``nested``."""
+    mapping = row._mapping
+    return {
+        name: nested[name] if nested and name in nested else mapping[prefix + name]
+        for name in schema.model_fields
+    }
+
+
+def _page_json(items: List[dict], next_cursor: Optional[str]) -> bytes:
+    return to_json({"items": items, "next_cursor": next_cursor})
+
+
+# ─── Flat listings ───────────────────────────────────────────
+
+def assessment_types_page_json(db: Session, cursor: Optional[str] = None, limit: int = 100) -> bytes:
+    page = paginate_select(db, select(*_columns(schemas.AssessmentTypeRead, models.AssessmentType)),
+                           (models.AssessmentType.id,), cursor, limit)
+    return _page_json([_item(schemas.AssessmentTypeRead, row) for row in page.items], page.next_cursor)
+
+
+def user_groups_page_json(db: Session, cursor: Optional[str] = None, limit: int = 100) -> bytes:
+    page = paginate_select(db, select(*_columns(schemas.UserGroupRead, models.UserGroup)),
+                           (models.UserGroup.id,), cursor, limit)
+    return _page_json([_item(schemas.UserGroupRead, row) for row in page.items], page.next_cursor)
+
+
+def options_page_json(db: Session, cursor: Optional[str] = None, limit: int = 100) -> bytes:
+    page = paginate_select(db, select(*_columns(schemas.OptionRead, models.Option)),
+                           (models.Option.id,), cursor, limit)
+    return _page_json([_item(schemas.OptionRead, row) for row in page.items], page.next_cursor)
+
+
+# ─── Listings with a nested parent (one JOIN) ────────────────
+
+def users_page_json(db: Session, cursor: Optional[str] = None, limit: int = 100) -> bytes:
+    stmt = (
+        select(
+            *_columns(schemas.UserRead, models.User),
+            *_columns(schemas.UserGroupRead, models.UserGroup, "group__"),
+        )
+        .join(models.UserGroup, models.UserGroup.id == models.User.group_id)
+    )
+    page = paginate_select(db, stmt, (models.User.id,), cursor, limit)
+    return _page_json([
+        _item(schemas.UserRead, row, {"group": _item(schemas.UserGroupRead, row, prefix="group__")})
+        for row in page.items
+    ], page.next_cursor)
+
+
+def assessments_page_json(db: Session, cursor: Optional[str] = None, limit: int = 100) -> bytes:
+    stmt = (
+        select(
+            *_columns(schemas.AssessmentRead, models.Assessment),
+            *_columns(schemas.AssessmentTypeRead, models.AssessmentType, "type__"),
+        )
+        .join(models.AssessmentType, models.AssessmentType.id == models.Assessment.type_id)
+    )
+    page = paginate_select(db, stmt, (models.Assessment.id,), cursor, limit)
+    return _page_json([
+        _item(schemas.AssessmentRead, row, {"type": _item(schemas.AssessmentTypeRead, row, prefix="type__")})
+        for row in page.items
+    ], page.next_cursor)
+
+
+# ─── Listings with nested collections (one IN query per level) ─
+
+def _option_sets_for(db: Session, question_ids: Sequence[int]) -> Dict[int, List[dict]]:
+    """question_id -> its OptionSetRead dicts (with options), in id order."""
+    if not question_ids:
+        return {}
+    sets = db.execute(
+        select(*_columns(schemas.OptionSetRead, models.OptionSet))
+        .where(models.OptionSet.question_id.in_(question_ids))
+        .order_by(models.OptionSet.id)
+    ).all()
+    options: Dict[int, List[dict]] = defaultdict(list)
+    if sets:
+        for row in db.execute(
+            select(*_columns(schemas.OptionRead, models.Option))
+            .where(models.Option.option_set_id.in_([s.id for s in sets]))
+            .order_by(models.Option.id)
+        ):
+            options[row.option_set_id].append(_item(schemas.OptionRead, row))
+
+    by_question: Dict[int, List[dict]] = defaultdict(list)
+    for row in sets:
+        by_question[row.question_id].append(_item(schemas.OptionSetRead, row, {"options": options[row.id]}))
+    return by_question
+
+
+def questions_page_json(db: Session, cursor: Optional[str] = None, limit: int = 100) -> bytes:
+    page = paginate_select(db, select(*_columns(schemas.QuestionRead, models.Question)),
+                           (models.Question.id,), cursor, limit)
+    option_sets = _option_sets_for(db, [row.id for row in page.items])
+    return _page_json([
+        _item(schemas.QuestionRead, row, {"option_sets": option_sets.get(row.id, [])})
+        for row in page.items
+    ], page.next_cursor)
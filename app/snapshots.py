@@ -0,0 +1,271 @@
+# app/snapshots.py
+"""
+Immutable, content-addressed snapshots of published question set versions.
+
+A published QuestionSet keeps its questions, but the payload also embeds each
+question's active OptionSet, which can still be switched afterwards. A
+snapshot is therefore stored under its *content version*: a digest of the set's
+active OptionSets and their options, looked up through the active-pointer cache
+(``SNAPSHOT_VERSION``), which the Option and OptionSet writers and
+``activate_question_set`` invalidate locally and over Redis pub/sub. A changed
+OptionSet or option yields a new version and so a new snapshot; the old one is
+never served again and ages out of the LRU (and Redis).
+
+The payload is serialized once per version – at ``activate_question_set``
+time, or on the first request after a change – into a compact JSON blob whose
+SHA-256 is its ETag. Candidates are then served from memory (or Redis, shared
+between workers), and clients revalidating with ``If-None-Match`` get a
+body-less 304. Only the active QuestionSet of an assessment is served; drafts
+and retired versions are never built or cached here.
+
+Option scores are deliberately left out of the payload: it is sent to candidates.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.cache import SNAPSHOT_VERSION, active_cache
+from app.config import get_settings
+from app.crud.assessment_tree import QuestionSetTree, load_question_set_tree
+from app.db_routing import primary_reads
+from app.models import Option, OptionSet, QuestionSet, question_set_questions
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    question_set_id: int
+    version: str  # content version (see get_snapshot_version)
+    etag: str    # strong validator, quoted as sent in the ETag header
+    body: bytes  # compact UTF-8 JSON
+
+
+@dataclass(frozen=True)
+class SnapshotResponse:
+    status_code: int  # 200, or 304 when If-None-Match matched
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _payload(tree: QuestionSetTree) -> dict:
+    return {
+        "id": tree.id,
+        "assessment_id": tree.assessment_id,
+        "version": tree.version,
+        "questions": [
+            {
+                "id": q.id,
+                "text": q.text,
+                "max_score": q.max_score,
+                "option_set": None if q.option_set is None else {
+                    "id": q.option_set.id,
+                    "version": q.option_set.version,
+                    "options": [{"id": o.id, "text": o.text} for o in q.option_set.options],
+                },
+            }
+            for q in tree.questions
+        ],
+    }
+
+
+def _load_version(db: Session, question_set_id: int) -> Optional[str]:
+    link = question_set_questions.c
+    rows = db.execute(
+        select(
+            QuestionSet.is_active,
+            OptionSet.id.label("option_set_id"), OptionSet.version,
+            Option.id.label("option_id"), Option.text, Option.score,
+        )
+        .select_from(QuestionSet)
+        .outerjoin(question_set_questions, link.question_set_id == QuestionSet.id)
+        .outerjoin(OptionSet, and_(OptionSet.question_id == link.question_id, OptionSet.is_active == True))
+        .outerjoin(Option, Option.option_set_id == OptionSet.id)
+        .where(QuestionSet.id == question_set_id)
+    ).all()
+    if not rows or not rows[0].is_active:
+        return None
+    # Everything the payload shows of the active OptionSets (and their scores),
+    # so editing an option of a published set yields a new version too
+    content = sorted(
+        (row.option_set_id, row.version, row.option_id or 0, row.text or "", row.score or 0)
+        for row in rows if row.option_set_id is not None
+    )
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def get_snapshot_version(db: Session, question_set_id: int) -> Optional[str]:
+    """Content version of an active QuestionSet's snapshot; None if the set is missing or not active."""
+    def load() -> Optional[str]:
+        with primary_reads(db):
+            return _load_version(db, question_set_id)
+
+    return active_cache.get_or_load(SNAPSHOT_VERSION, question_set_id, load)
+
+
+def build_snapshot(db: Session, question_set_id: int, version: str) -> Optional[Snapshot]:
+    tree = load_question_set_tree(db, question_set_id)
+    if tree is None:
+        return None
+    body = json.dumps(_payload(tree), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return Snapshot(
+        question_set_id=question_set_id,
+        version=version,
+        etag='"' + hashlib.sha256(body).hexdigest() + '"',
+        body=body,
+    )
+
+
+# ─── Storage ─────────────────────────────────────────────────
+
+class SnapshotStore:
+    """
+    Local LRU of snapshots with an optional Redis tier shared by all workers,
+    keyed by (question set id, content version). Entries are never updated in
+    place, so no worker can serve one that a newer version replaced.
+    """
+
+    def __init__(self, max_entries: int = 256, redis_url: Optional[str] = None, redis_prefix: str = "vils:snapshot",
+                 redis_ttl_seconds: int = 86400):
+        self.max_entries = max_entries
+        self.redis_prefix = redis_prefix
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._entries: "OrderedDict[Tuple[int, str], Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url)
+
+    def _key(self, question_set_id: int, version: str) -> str:
+        return f"{self.redis_prefix}:{question_set_id}:{version}"
+
+    def get(self, question_set_id: int, version: str) -> Optional[Snapshot]:
+        with self._lock:
+            snapshot = self._entries.get((question_set_id, version))
+            if snapshot is not None:
+                self._entries.move_to_end((question_set_id, version))
+                return snapshot
+        if self._redis is None:
+            return None
+        try:
+            stored = self._redis.hgetall(self._key(question_set_id, version))
+        except Exception:
+            logger.warning("Snapshot lookup in Redis failed", exc_info=True)
+            return None
+        if not stored:
+            return None
+        snapshot = Snapshot(question_set_id, version, stored[b"etag"].decode(), stored[b"body"])
+        self._remember(snapshot)
+        return snapshot
+
+    def put(self, snapshot: Snapshot) -> None:
+        self._remember(snapshot)
+        if self._redis is not None:
+            key = self._key(snapshot.question_set_id, snapshot.version)
+            try:
+                with self._redis.pipeline() as pipe:
+                    pipe.hset(key, mapping={"etag": snapshot.etag, "body": snapshot.body})
+                    pipe.expire(key, self.redis_ttl_seconds)
+                    pipe.execute()
+            except Exception:
+                logger.warning("Snapshot write to Redis failed", exc_info=True)
+
+    def discard(self, question_set_id: int, version: str) -> None:
+        with self._lock:
+            self._entries.pop((question_set_id, version), None)
+        if self._redis is not None:
+            try:
+                self._redis.delete(self._key(question_set_id, version))
+            except Exception:
+                logger.warning("Snapshot delete in Redis failed", exc_info=True)
+
+    def _remember(self, snapshot: Snapshot) -> None:
+        key = (snapshot.question_set_id, snapshot.version)
+        with self._lock:
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_snapshot_store: Optional[SnapshotStore] = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """The process-wide store, created from the settings on first use."""
+    global _snapshot_store
+    if _snapshot_store is None:
+        with _snapshot_store_lock:
+            if _snapshot_store is None:
+                settings = get_settings()
+                _snapshot_store = SnapshotStore(
+                    max_entries=settings.snapshot_cache_max_entries,
+                    redis_url=settings.redis_url,
+                    redis_prefix=settings.snapshot_redis_prefix,
+                    redis_ttl_seconds=settings.snapshot_redis_ttl_seconds,
+                )
+    return _snapshot_store
+
+
+def __getattr__(name: str):
+    # `snapshot_store` used to be built at import
+    if name == "snapshot_store":
+        return get_snapshot_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ─── Publishing / serving ────────────────────────────────────
+
+def publish_snapshot(db: Session, question_set_id: int) -> Optional[Snapshot]:
+    """Build and store the snapshot of an active question set (run on activation); None if it isn't active."""
+    version = get_snapshot_version(db, question_set_id)
+    if version is None:
+        return None
+    # Built from the primary, like its version: a lagging replica would store old content under it
+    with primary_reads(db):
+        snapshot = build_snapshot(db, question_set_id, version)
+    if snapshot is not None:
+        get_snapshot_store().put(snapshot)
+    return snapshot
+
+
+def get_snapshot(db: Session, question_set_id: int) -> Optional[Snapshot]:
+    version = get_snapshot_version(db, question_set_id)
+    if version is None:
+        return None
+    return get_snapshot_store().get(question_set_id, version) or publish_snapshot(db, question_set_id)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def serve_snapshot(db: Session, question_set_id: int, if_none_match: Optional[str] = None) -> Optional[SnapshotResponse]:
+    """200 with the snapshot, 304 when ``If-None-Match`` already names it, None if the set doesn't exist or isn't active."""
+    snapshot = get_snapshot(db, question_set_id)
+    if snapshot is None:
+        return None
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={get_settings().snapshot_max_age_seconds}",
+    }
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return SnapshotResponse(status_code=304, body=b"", headers=headers)
+    headers["Content-Type"] = "application/json"
+    return SnapshotResponse(status_code=200, body=snapshot.body, headers=headers)
@@ -0,0 +1,39 @@
+# app/tasks.py
+from datetime import timedelta
+from typing import List
+
+from celery import Task
+from sqlalchemy.exc import DBAPIError
+
+from app.celery_app import celery_app
+from app.config import get_settings
+from app.crud import score
+from app.database import SessionLocal
+
+
+class ScoringTask(Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        # Retries are exhausted (or the error isn't retryable): surface it in the status API
+        question_set_id, submission_ids = args
+        with SessionLocal() as db:
+            score.mark_failed(db, submission_ids, f"{type(exc).__name__}: {exc}")
+
+
+@celery_app.task(
+    base=ScoringTask,
+    name="scoring.score_submissions",
+    autoretry_for=(DBAPIError,),   # deadlocks, lost connections, failover
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=5,
+)
+def score_submissions_task(question_set_id: int, submission_ids: List[int]) -> int:
+    with SessionLocal() as db:
+        return score.score_submissions(db, question_set_id, submission_ids)
+
+
+@celery_app.task(name="scoring.requeue_stale_scores")
+def requeue_stale_scores_task() -> int:
+    # Scheduled by celery beat (see celery_app.beat_schedule)
+    with SessionLocal() as db:
+        return score.requeue_stale_scores(db, timedelta(seconds=get_settings().scoring_stale_seconds))
@@ -0,0 +1,534 @@
+# benchmarks/cases.py
+"""
+One benchmark case per public function in app/crud/*.py, plus the flush-time
+model validators.
+
+A case is ``run(db, ctx, arg)``, timed; the optional ``setup(db, ctx, i)``
+runs untimed right before it in the same session and returns ``arg`` (e.g.
+the row a delete case removes). ``budget`` is the most statements one call
+may issue: benchmarks.run checks every call with
+``app.query_counter.assert_query_budget`` and fails the case when a call goes
+over it or repeats a SELECT like an N+1 lazy load. Lower a budget when a
+change saves queries; raising one is a regression to justify in review. Write cases commit like the app does, so the
+database grows a little during a run; every run starts from the seeded state
+again (``--reuse`` restores it instead of reseeding).
+
+Not covered: ``score.wait_for_thread_scoring`` (drains a thread pool, no
+database work) and ``aio.*`` (thin run_sync wrappers over these same calls).
+"""
+import io
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.crud import (
+    assessment,
+    assessment_tree,
+    assessment_type,
+    option,
+    option_set,
+    question,
+    question_set,
+    score,
+    submission,
+    user,
+    user_group,
+    user_import,
+    version_counter,
+)
+
+from app.password_verification import get_password_hash
+from benchmarks.datagen import PASSWORD, Seeded
+
+
+@dataclass
+class Context:
+    seeded: Seeded
+    rng: random.Random
+    state: dict = field(default_factory=dict)  # per-case scratch space
+
+    def question_id(self) -> int:
+        return self.rng.randint(1, self.seeded.questions)
+
+    def active_question_set_id(self) -> int:
+        return self.rng.choice(self.seeded.active_question_set_ids)
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[Session, Context, Any], Any]
+    setup: Optional[Callable[[Session, Context, int], Any]] = None
+    budget: Optional[int] = None  # max statements per call
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, setup: Optional[Callable[[Session, Context, int], Any]] = None, budget: Optional[int] = None):
+    def register(run):
+        CASES.append(Case(name, run, setup, budget))
+        return run
+    return register
+
+
+def _unique(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def _option_set_in(db: Session, ctx: Context, i: int) -> models.OptionSet:
+    return option_set.create_option_set(db, schemas.OptionSetCreate(
+        question_id=ctx.question_id(), version=1000 + i, is_active=False,
+        options=[schemas.OptionBase(text="a", score=0), schemas.OptionBase(text="b", score=1)],
+    ))
+
+# ─── assessment ──────────────────────────────────────────────
+
+@case("crud.assessment.create_assessment", budget=3)
+def _(db, ctx, _arg):
+    assessment.create_assessment(db, schemas.AssessmentCreate(
+        title="bench", type_id=ctx.rng.randint(1, ctx.seeded.assessment_types)))
+
+@case("crud.assessment.get_assessment", budget=1)
+def _(db, ctx, _arg):
+    assessment.get_assessment(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+@case("crud.assessment.get_assessments", budget=1)
+def _(db, ctx, _arg):
+    assessment.get_assessments(db, skip=ctx.rng.randint(0, ctx.seeded.assessments), limit=100)
+
+@case("crud.assessment.get_assessments_page", budget=1)
+def _(db, ctx, _arg):
+    assessment.get_assessments_page(db, limit=100)
+
+@case("crud.assessment.activate_assessment", budget=4)
+def _(db, ctx, _arg):
+    assessment.activate_assessment(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+@case("crud.assessment.get_active_assessment_id_by_type", budget=1)
+def _(db, ctx, _arg):
+    assessment.get_active_assessment_id_by_type(db, ctx.rng.randint(1, ctx.seeded.assessment_types))
+
+@case("crud.assessment.get_active_assessment_by_type", budget=1)
+def _(db, ctx, _arg):
+    assessment.get_active_assessment_by_type(db, ctx.rng.randint(1, ctx.seeded.assessment_types))
+
+# ─── assessment_tree ─────────────────────────────────────────
+
+@case("crud.assessment_tree.load_question_set_tree", budget=4)
+def _(db, ctx, _arg):
+    assessment_tree.load_question_set_tree(db, ctx.active_question_set_id())
+
+@case("crud.assessment_tree.load_assessment_tree", budget=6)
+def _(db, ctx, _arg):
+    assessment_tree.load_assessment_tree(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+# ─── assessment_type ─────────────────────────────────────────
+
+@case("crud.assessment_type.create_assessment_type", budget=2)
+def _(db, ctx, _arg):
+    assessment_type.create_assessment_type(db, schemas.AssessmentTypeCreate(name=_unique("type")))
+
+@case("crud.assessment_type.get_assessment_type", budget=1)
+def _(db, ctx, _arg):
+    assessment_type.get_assessment_type(db, ctx.rng.randint(1, ctx.seeded.assessment_types))
+
+@case("crud.assessment_type.get_assessment_types", budget=1)
+def _(db, ctx, _arg):
+    assessment_type.get_assessment_types(db)
+
+@case("crud.assessment_type.get_assessment_types_page", budget=1)
+def _(db, ctx, _arg):
+    assessment_type.get_assessment_types_page(db)
+
+# ─── option ──────────────────────────────────────────────────
+
+def _seeded_option(db, ctx, _i):
+    return db.get(models.Option, ctx.rng.randint(1, ctx.seeded.options))
+
+def _new_option(db, ctx, _i):
+    return option.create_option(db, schemas.OptionCreate(
+        text="tmp", score=0, option_set_id=ctx.rng.randint(1, ctx.seeded.option_sets)))
+
+@case("crud.option.get_option", budget=1)
+def _(db, ctx, _arg):
+    option.get_option(db, ctx.rng.randint(1, ctx.seeded.options))
+
+@case("crud.option.get_options", budget=1)
+def _(db, ctx, _arg):
+    option.get_options(db, skip=ctx.rng.randint(0, ctx.seeded.options), limit=100)
+
+@case("crud.option.get_options_page", budget=1)
+def _(db, ctx, _arg):
+    option.get_options_page(db, limit=100)
+
+@case("crud.option.create_option", budget=3)
+def _(db, ctx, _arg):
+    _new_option(db, ctx, 0)
+
+@case("crud.option.update_option", setup=_seeded_option, budget=1)
+def _(db, ctx, opt):
+    option.update_option(db, opt, schemas.OptionCreate(text=opt.text, score=opt.score, option_set_id=opt.option_set_id))
+
+@case("crud.option.delete_option", setup=_new_option, budget=1)
+def _(db, ctx, opt):
+    option.delete_option(db, opt)
+
+# ─── option_set ──────────────────────────────────────────────
+
+@case("crud.option_set.get_option_set", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_option_set(db, ctx.rng.randint(1, ctx.seeded.option_sets))
+
+@case("crud.option_set.get_option_sets", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_option_sets(db, skip=ctx.rng.randint(0, ctx.seeded.option_sets), limit=100)
+
+@case("crud.option_set.get_option_sets_page", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_option_sets_page(db, limit=100)
+
+@case("crud.option_set.get_option_sets_by_question_page", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_option_sets_by_question_page(db, ctx.question_id())
+
+@case("crud.option_set.get_active_option_set_id_by_question", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_active_option_set_id_by_question(db, ctx.question_id())
+
+@case("crud.option_set.get_active_option_set_by_question", budget=2)
+def _(db, ctx, _arg):
+    option_set.get_active_option_set_by_question(db, ctx.question_id())
+
+@case("crud.option_set.create_option_set", budget=4)
+def _(db, ctx, _arg):
+    _option_set_in(db, ctx, ctx.rng.randint(0, 10**6))
+
+@case("crud.option_set.bulk_create_option_sets", budget=22)
+def _(db, ctx, _arg):
+    option_set.bulk_create_option_sets(db, [
+        schemas.OptionSetCreate(
+            question_id=ctx.question_id(), version=2000 + n, is_active=False,
+            options=[schemas.OptionBase(text=f"o{k}", score=0) for k in range(4)],
+        )
+        for n in range(20)
+    ])
+
+@case("crud.option_set.update_option_set", setup=_option_set_in, budget=2)
+def _(db, ctx, os):
+    option_set.update_option_set(db, os, schemas.OptionSetCreate(
+        question_id=os.question_id, version=os.version + 1, is_active=False))
+
+def _empty_option_set(db, ctx, i):
+    # delete_option_set doesn't cascade to options, so delete a set without any
+    return option_set.create_option_set(db, schemas.OptionSetCreate(
+        question_id=ctx.question_id(), version=3000 + i, is_active=False))
+
+@case("crud.option_set.delete_option_set", setup=_empty_option_set, budget=2)
+def _(db, ctx, os):
+    option_set.delete_option_set(db, os)
+
+# Seeded option sets come in lineages: 2q-1 (v1) -> 2q (v2)
+@case("crud.option_set.get_option_set_ancestors", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_option_set_ancestors(db, 2 * ctx.question_id())
+
+@case("crud.option_set.get_option_set_descendants", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_option_set_descendants(db, 2 * ctx.question_id() - 1)
+
+@case("crud.option_set.get_latest_descendant_id", budget=1)
+def _(db, ctx, _arg):
+    option_set.get_latest_descendant_id(db, 2 * ctx.question_id() - 1)
+
+@case("crud.option_set.get_latest_descendant", budget=2)
+def _(db, ctx, _arg):
+    option_set.get_latest_descendant(db, 2 * ctx.question_id() - 1)
+
+@case("crud.option_set.diff_option_sets", budget=1)
+def _(db, ctx, _arg):
+    q = ctx.question_id()
+    option_set.diff_option_sets(db, 2 * q - 1, 2 * q)
+
+# ─── question ────────────────────────────────────────────────
+
+@case("crud.question.create_question", budget=2)
+def _(db, ctx, _arg):
+    question.create_question(db, schemas.QuestionCreate(text="bench?", max_score=5))
+
+@case("crud.question.get_question", budget=1)
+def _(db, ctx, _arg):
+    question.get_question(db, ctx.question_id())
+
+@case("crud.question.get_questions", budget=1)
+def _(db, ctx, _arg):
+    question.get_questions(db, skip=ctx.rng.randint(0, ctx.seeded.questions), limit=100)
+
+@case("crud.question.get_questions_page", budget=1)
+def _(db, ctx, _arg):
+    question.get_questions_page(db, limit=100)
+
+@case("crud.question.get_questions_by_question_set", budget=1)
+def _(db, ctx, _arg):
+    question.get_questions_by_question_set(db, ctx.active_question_set_id())
+
+# ─── question_set ────────────────────────────────────────────
+
+@case("crud.question_set.create_question_set", budget=4)
+def _(db, ctx, _arg):
+    question_set.create_question_set(db, schemas.QuestionSetCreate(
+        assessment_id=ctx.rng.randint(1, ctx.seeded.assessments),
+        question_ids=ctx.rng.sample(range(1, ctx.seeded.questions + 1), 50),
+    ))
+
+@case("crud.question_set.derive_question_set", budget=6)
+def _(db, ctx, _arg):
+    question_set.derive_question_set(db, schemas.QuestionSetDerive(
+        base_question_set_id=ctx.active_question_set_id(),
+        add_question_ids=ctx.rng.sample(range(1, ctx.seeded.questions + 1), 2),
+        remove_question_ids=[],
+    ))
+
+@case("crud.question_set.get_question_set", budget=1)
+def _(db, ctx, _arg):
+    question_set.get_question_set(db, ctx.rng.randint(1, ctx.seeded.question_sets))
+
+@case("crud.question_set.get_question_sets_by_assessment", budget=1)
+def _(db, ctx, _arg):
+    question_set.get_question_sets_by_assessment(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+@case("crud.question_set.get_question_sets_by_assessment_page", budget=1)
+def _(db, ctx, _arg):
+    question_set.get_question_sets_by_assessment_page(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+@case("crud.question_set.get_active_question_set_id_by_assessment", budget=1)
+def _(db, ctx, _arg):
+    question_set.get_active_question_set_id_by_assessment(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+@case("crud.question_set.get_active_question_set_by_assessment", budget=2)
+def _(db, ctx, _arg):
+    question_set.get_active_question_set_by_assessment(db, ctx.rng.randint(1, ctx.seeded.assessments))
+
+@case("crud.question_set.activate_question_set", budget=8)
+def _(db, ctx, _arg):
+    question_set.activate_question_set(db, ctx.active_question_set_id())
+
+# ─── score ───────────────────────────────────────────────────
+
+SCORE_BATCH = 100
+
+def _submission_batch(db, ctx, _i):
+    """SCORE_BATCH consecutive submissions of one set, with no score rows yet."""
+    qs_id = ctx.active_question_set_id()
+    ids = db.execute(
+        select(models.Submission.id).where(models.Submission.question_set_id == qs_id)
+        .order_by(models.Submission.id).offset(ctx.rng.randint(0, SCORE_BATCH)).limit(SCORE_BATCH)
+    ).scalars().all()
+    db.execute(delete(models.SubmissionScore).where(models.SubmissionScore.submission_id.in_(ids)))
+    db.commit()
+    return qs_id, ids
+
+def _pending_batch(db, ctx, i):
+    qs_id, ids = _submission_batch(db, ctx, i)
+    score.add_pending_scores(db, [(sub_id, qs_id) for sub_id in ids])
+    db.commit()
+    return qs_id, ids
+
+@case("crud.score.add_pending_scores", setup=_submission_batch, budget=1)
+def _(db, ctx, batch):
+    qs_id, ids = batch
+    score.add_pending_scores(db, [(sub_id, qs_id) for sub_id in ids])
+    db.commit()
+
+@case("crud.score.dispatch_scoring", setup=_pending_batch, budget=6)
+def _(db, ctx, batch):
+    qs_id, ids = batch
+    score.dispatch_scoring([(sub_id, qs_id) for sub_id in ids])
+
+@case("crud.score.finalize_submissions", setup=_submission_batch, budget=8)
+def _(db, ctx, batch):
+    score.finalize_submissions(db, batch[1])
+
+@case("crud.score.score_submissions", setup=_pending_batch, budget=6)
+def _(db, ctx, batch):
+    score.score_submissions(db, *batch)
+
+@case("crud.score.mark_failed", setup=_pending_batch, budget=1)
+def _(db, ctx, batch):
+    score.mark_failed(db, batch[1], "benchmark")
+
+@case("crud.score.get_submission_score", budget=1)
+def _(db, ctx, _arg):
+    score.get_submission_score(db, ctx.rng.randint(1, ctx.seeded.submissions))
+
+@case("crud.score.get_submission_scores", budget=1)
+def _(db, ctx, _arg):
+    start = ctx.rng.randint(1, max(1, ctx.seeded.submissions - SCORE_BATCH))
+    score.get_submission_scores(db, range(start, start + SCORE_BATCH))
+
+@case("crud.score.get_scoring_progress", budget=1)
+def _(db, ctx, _arg):
+    score.get_scoring_progress(db, ctx.active_question_set_id())
+
+# ─── submission ──────────────────────────────────────────────
+
+INGEST_BATCH = 50
+
+def _ingest_batch(db, ctx, i):
+    # Seeded submissions only target active sets, so inactive ones take new pairs
+    inactive = sorted(set(range(1, ctx.seeded.question_sets + 1)) - set(ctx.seeded.active_question_set_ids))
+    n = ctx.state["ingested"] = ctx.state.get("ingested", 0) + 1
+    qs_id = inactive[n % len(inactive)]
+    first_user = (n // len(inactive)) * INGEST_BATCH
+    question_ids = db.execute(
+        select(models.question_set_questions.c.question_id)
+        .where(models.question_set_questions.c.question_set_id == qs_id)
+    ).scalars().all()
+    return [
+        schemas.SubmissionCreate(
+            user_id=(first_user + u) % ctx.seeded.users + 1,
+            question_set_id=qs_id,
+            responses=[
+                schemas.ResponseCreate(question_id=q, option_id=(2 * q - 1) * 4 + ctx.rng.randrange(4) + 1)
+                for q in question_ids
+            ],
+        )
+        for u in range(INGEST_BATCH)
+    ]
+
+@case("crud.submission.bulk_create_submissions", setup=_ingest_batch, budget=14)
+def _(db, ctx, items):
+    submission.bulk_create_submissions(db, items, enqueue_scoring=False)
+
+def _autosave(db, ctx, _i):
+    """A seeded submission's full answer sheet, every answer re-picked (existing rows)."""
+    sub_id = ctx.rng.randint(1, ctx.seeded.submissions)
+    question_ids = db.execute(
+        select(models.Response.question_id).where(models.Response.submission_id == sub_id)
+    ).scalars().all()
+    return sub_id, [
+        schemas.ResponseCreate(question_id=q, option_id=(2 * q - 1) * 4 + ctx.rng.randrange(4) + 1)
+        for q in question_ids
+    ]
+
+@case("crud.submission.upsert_responses", setup=_autosave, budget=18)
+def _(db, ctx, arg):
+    submission.upsert_responses(db, *arg)
+
+@case("crud.submission.get_responses_page", budget=1)
+def _(db, ctx, _arg):
+    submission.get_responses_page(db, ctx.active_question_set_id(), limit=100)
+
+# ─── user ────────────────────────────────────────────────────
+
+def _seeded_user(db, ctx, _i):
+    return db.get(models.User, ctx.rng.randint(1, ctx.seeded.users))
+
+@case("crud.user.create_user", budget=2)
+def _(db, ctx, _arg):
+    name = _unique("bench")
+    user.create_user(db, schemas.UserCreate(username=name, email=f"{name}@bench.example", password=PASSWORD, group_id=1))
+
+@case("crud.user.get_user", budget=1)
+def _(db, ctx, _arg):
+    user.get_user(db, ctx.rng.randint(1, ctx.seeded.users))
+
+@case("crud.user.get_users", budget=1)
+def _(db, ctx, _arg):
+    user.get_users(db, skip=ctx.rng.randint(0, ctx.seeded.users), limit=100)
+
+@case("crud.user.get_users_page", budget=1)
+def _(db, ctx, _arg):
+    user.get_users_page(db, limit=100)
+
+@case("crud.user.get_user_by_email", budget=1)
+def _(db, ctx, _arg):
+    user.get_user_by_email(db, f"user{ctx.rng.randint(1, ctx.seeded.users)}@bench.example")
+
+def _user_and_new_hash(db, ctx, i):
+    return _seeded_user(db, ctx, i), get_password_hash(PASSWORD)
+
+@case("crud.user.set_user_password_hash", setup=_user_and_new_hash, budget=1)
+def _(db, ctx, arg):
+    user.set_user_password_hash(db, *arg)
+
+@case("crud.user.authenticate_user", budget=1)
+def _(db, ctx, _arg):
+    user.authenticate_user(db, f"user{ctx.rng.randint(1, ctx.seeded.users)}@bench.example", PASSWORD)
+
+# ─── user_group ──────────────────────────────────────────────
+
+def _new_group(db, ctx, _i):
+    return user_group.create_user_group(db, schemas.UserGroupCreate(name=_unique("group"), assessment_type_id=1))
+
+@case("crud.user_group.get_user_group", budget=1)
+def _(db, ctx, _arg):
+    user_group.get_user_group(db, ctx.rng.randint(1, 20))
+
+@case("crud.user_group.get_user_groups", budget=1)
+def _(db, ctx, _arg):
+    user_group.get_user_groups(db)
+
+@case("crud.user_group.get_user_groups_page", budget=1)
+def _(db, ctx, _arg):
+    user_group.get_user_groups_page(db)
+
+@case("crud.user_group.create_user_group", budget=2)
+def _(db, ctx, _arg):
+    _new_group(db, ctx, 0)
+
+@case("crud.user_group.update_user_group", setup=_new_group, budget=2)
+def _(db, ctx, group):
+    user_group.update_user_group(db, group, schemas.UserGroupCreate(name=group.name, assessment_type_id=2))
+
+@case("crud.user_group.delete_user_group", setup=_new_group, budget=2)
+def _(db, ctx, group):
+    user_group.delete_user_group(db, group)
+
+# ─── user_import ─────────────────────────────────────────────
+
+IMPORT_ROWS = 100
+
+def _import_csv(db, ctx, _i):
+    prefix = _unique("import")
+    lines = ["username,email,password,group_id"] + [
+        f"{prefix}-{n},{prefix}-{n}@bench.example,{PASSWORD},1" for n in range(IMPORT_ROWS)
+    ]
+    return "\n".join(lines)
+
+@case("crud.user_import.import_users_csv", setup=_import_csv, budget=3)
+def _(db, ctx, text):
+    for _result in user_import.import_users_csv(db, io.StringIO(text)):
+        pass
+
+# ─── version_counter ─────────────────────────────────────────
+
+@case("crud.version_counter.allocate_version", budget=1)
+def _(db, ctx, _arg):
+    version_counter.allocate_version(
+        db, version_counter.QUESTION_SET_VERSIONS, ctx.rng.randint(1, ctx.seeded.assessments))
+    db.commit()
+
+# ─── models: flush-time validators ───────────────────────────
+# Flushed, then rolled back: measures the before_flush checks plus the INSERTs
+
+def _inactive_type(db, ctx, _i):
+    return assessment_type.create_assessment_type(db, schemas.AssessmentTypeCreate(name=_unique("vtype"))).id
+
+@case("models.validate_flush.single_active", setup=_inactive_type, budget=1)
+def _(db, ctx, type_id):
+    db.add(models.Assessment(title="bench", type_id=type_id, version=1, is_active=True))
+    db.flush()
+    db.rollback()
+
+@case("models.validate_flush.option_scores", budget=101)
+def _(db, ctx, _arg):
+    os_id = ctx.rng.randint(1, ctx.seeded.option_sets)
+    db.add_all(models.Option(text=f"v{n}", score=0, option_set_id=os_id) for n in range(100))
+    db.flush()
+    db.rollback()
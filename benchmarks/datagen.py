@@ -0,0 +1,199 @@
+# benchmarks/datagen.py
+"""
+Deterministic data generator for the benchmark database.
+
+Same scale + seed gives byte-for-byte the same rows, so two benchmark runs
+(before/after a change) see identical data. Rows are written with Core
+executemany in chunks and explicit ids, never through the ORM.
+"""
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List
+
+from sqlalchemy import Engine, insert
+
+from app import models
+from app.database import Base
+
+CHUNK_SIZE = 10_000
+
+# bcrypt hash of "password" at cost 4 (the runner sets BCRYPT_ROUNDS=4 to match)
+PASSWORD = "password"
+PASSWORD_HASH = "$2b$04$b2HWAYy7ovoSpLRszoYdseDUZoo2anUuTtarmRUAzb3xKikG.icCq"
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    questions: int
+    responses: int
+    assessment_types: int = 5
+    groups_per_type: int = 4
+    assessments_per_type: int = 3
+    question_sets_per_assessment: int = 3
+    questions_per_set: int = 50
+    options_per_set: int = 4
+
+    @property
+    def submissions(self) -> int:
+        return self.responses // self.questions_per_set
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(users=1_000, questions=200, responses=50_000),
+    "small": Scale(users=10_000, questions=500, responses=500_000),
+    "full": Scale(users=100_000, questions=1_000, responses=5_000_000),
+}
+
+
+@dataclass
+class Seeded:
+    """Id ranges the benchmark cases draw their arguments from."""
+    scale: str
+    seed: int
+    users: int
+    questions: int
+    assessment_types: int
+    assessments: int
+    question_sets: int
+    option_sets: int
+    options: int
+    submissions: int
+    responses: int
+    active_question_set_ids: List[int]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _chunks(rows: Iterator[dict]) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed_database(engine: Engine, scale_name: str, seed: int = 42) -> Seeded:
+    scale = SCALES[scale_name]
+    rng = random.Random(seed)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    def write(table, rows) -> None:
+        with engine.begin() as conn:
+            for chunk in _chunks(iter(rows)):
+                conn.execute(insert(table), chunk)
+
+    # Catalogue: types, groups, users
+    types = range(1, scale.assessment_types + 1)
+    write(models.AssessmentType, ({"id": t, "name": f"type-{t}"} for t in types))
+    n_groups = scale.assessment_types * scale.groups_per_type
+    write(models.UserGroup, (
+        {"id": g, "name": f"group-{g}", "assessment_type_id": (g - 1) // scale.groups_per_type + 1}
+        for g in range(1, n_groups + 1)
+    ))
+    write(models.User, (
+        {
+            "id": u,
+            "username": f"user{u}",
+            "email": f"user{u}@bench.example",
+            "full_name": f"User {u}",
+            "hashed_password": PASSWORD_HASH,
+            "group_id": rng.randint(1, n_groups),
+        }
+        for u in range(1, scale.users + 1)
+    ))
+
+    # Questions, each with two option set versions: v1 (inactive) -> v2 (active)
+    max_scores = {q: rng.choice((1, 2, 4, 5, 10)) for q in range(1, scale.questions + 1)}
+    write(models.Question, (
+        {"id": q, "text": f"Question {q}?", "max_score": m} for q, m in max_scores.items()
+    ))
+    write(models.OptionSet, (
+        {
+            "id": 2 * q - 1 + v,
+            "question_id": q,
+            "version": v + 1,
+            "is_active": v == 1,
+            "parent_id": 2 * q - 1 if v == 1 else None,
+        }
+        for q in max_scores for v in (0, 1)
+    ))
+    n_option_sets = 2 * scale.questions
+    k = scale.options_per_set
+    write(models.Option, (
+        {
+            "id": (os_id - 1) * k + i + 1,
+            "option_set_id": os_id,
+            "text": f"Option {i + 1}",
+            "score": max_scores[(os_id + 1) // 2] * i // (k - 1),
+        }
+        for os_id in range(1, n_option_sets + 1) for i in range(k)
+    ))
+
+    # Versioned assessments and question sets; the last version of each is active
+    assessments, question_sets, links = [], [], []
+    active_sets: List[int] = []
+    for t in types:
+        for v in range(1, scale.assessments_per_type + 1):
+            a_id = len(assessments) + 1
+            assessments.append({
+                "id": a_id, "title": f"Assessment {t}.{v}", "description": None,
+                "type_id": t, "version": v, "is_active": v == scale.assessments_per_type,
+            })
+            for qv in range(1, scale.question_sets_per_assessment + 1):
+                qs_id = len(question_sets) + 1
+                active = qv == scale.question_sets_per_assessment
+                question_sets.append({"id": qs_id, "assessment_id": a_id, "version": qv, "is_active": active})
+                for q in sorted(rng.sample(range(1, scale.questions + 1), scale.questions_per_set)):
+                    links.append({"question_set_id": qs_id, "question_id": q})
+                if active:
+                    active_sets.append(qs_id)
+    write(models.Assessment, assessments)
+    write(models.QuestionSet, question_sets)
+    write(models.question_set_questions, links)
+
+    # Submissions against the active sets; one response per question of the set
+    set_questions: Dict[int, List[int]] = {}
+    for link in links:
+        set_questions.setdefault(link["question_set_id"], []).append(link["question_id"])
+    n_subs = min(scale.submissions, scale.users * len(active_sets))
+    sub_sets = [active_sets[(s - 1) // scale.users] if n_subs > scale.users else rng.choice(active_sets)
+                for s in range(1, n_subs + 1)]
+    write(models.Submission, (
+        {"id": s, "user_id": (s - 1) % scale.users + 1, "question_set_id": qs_id}
+        for s, qs_id in enumerate(sub_sets, start=1)
+    ))
+
+    def responses() -> Iterator[dict]:
+        r_id = 0
+        for s, qs_id in enumerate(sub_sets, start=1):
+            for q in set_questions[qs_id]:
+                r_id += 1
+                active_os = 2 * q
+                yield {
+                    "id": r_id,
+                    "submission_id": s,
+                    "question_id": q,
+                    "option_id": (active_os - 1) * k + rng.randrange(k) + 1,
+                }
+    write(models.Response, responses())
+
+    return Seeded(
+        scale=scale_name,
+        seed=seed,
+        users=scale.users,
+        questions=scale.questions,
+        assessment_types=scale.assessment_types,
+        assessments=len(assessments),
+        question_sets=len(question_sets),
+        option_sets=n_option_sets,
+        options=n_option_sets * k,
+        submissions=n_subs,
+        responses=n_subs * scale.questions_per_set,
+        active_question_set_ids=active_sets,
+    )
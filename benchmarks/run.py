@@ -0,0 +1,234 @@
+# benchmarks/run.py
+"""
+Benchmark every CRUD path against a seeded database.
+
+    python -m benchmarks.run --scale small --output benchmarks/results/after.json \\
+        --baseline benchmarks/results/before.json --threshold 0.25
+
+Seeds a fresh SQLite file (or --db-url, e.g. a local MySQL scratch schema)
+with the deterministic generator, then times each case in benchmarks.cases
+and reports p50/p95 latency, queries issued (app.query_counter) and ORM rows
+materialized per call. A call over its case's query budget (or showing an
+N+1 pattern) fails the case, and the run exits 1. With --baseline, exits 1 when a case's p95 grows past
+the threshold (and the noise floor) or it issues more queries than before.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB = Path(__file__).resolve().parent / "bench.db"
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", default="tiny", help="tiny | small | full (default: tiny)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default=f"sqlite:///{DEFAULT_DB}")
+    parser.add_argument("--reuse", action="store_true",
+                        help="skip seeding: restore the SQLite file as seeded by the previous run")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative p95 growth")
+    parser.add_argument("--noise-ms", type=float, default=1.0, help="ignore p95 growth below this")
+    return parser.parse_args(argv)
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    # Must happen before the settings are first read (first session / engine use)
+    os.environ["DB_URL"] = args.db_url
+    os.environ["BCRYPT_ROUNDS"] = "4"      # matches datagen.PASSWORD_HASH
+    os.environ["SCORING_MODE"] = "eager"   # score inline, no broker needed
+    os.environ.setdefault("DB_ECHO", "false")
+
+
+def _pristine_copy(engine) -> Optional[Path]:
+    """Where the as-seeded copy of a SQLite database file is kept (None for other backends)."""
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return None
+    return Path(engine.url.database + ".pristine")
+
+
+def _seed_record(engine) -> Path:
+    """Where the Seeded summary of a database's last seed is kept: beside its SQLite file if it has one."""
+    if _pristine_copy(engine) is None:
+        return Path(str(DEFAULT_DB) + ".seed.json")
+    return Path(engine.url.database + ".seed.json")
+
+
+def seed_or_reuse(engine, args: argparse.Namespace):
+    """
+    Seed ``engine`` per --scale/--seed, or with --reuse restore the previous
+    seed. Write cases commit, so a reused database must be put back to its
+    as-seeded state: the SQLite file is copied back from the pristine copy
+    taken after seeding; other backends are reseeded.
+    """
+    from benchmarks.datagen import Seeded, seed_database
+
+    seed_file = _seed_record(engine)
+    pristine = _pristine_copy(engine)
+    if args.reuse and seed_file.exists() and json.loads(seed_file.read_text())["db_url"] == args.db_url:
+        if pristine is not None and pristine.exists():
+            seeded = Seeded(**json.loads(seed_file.read_text())["seeded"])
+            engine.dispose()  # no pooled connection may hold the old file
+            shutil.copyfile(pristine, engine.url.database)
+            print(f"reusing {args.db_url} ({seeded.scale}, seed {seeded.seed})")
+            return seeded
+        print("--reuse needs the pristine SQLite copy of a previous seed; reseeding")
+    start = time.perf_counter()
+    seeded = seed_database(engine, args.scale, args.seed)
+    if pristine is not None:
+        engine.dispose()
+        shutil.copyfile(engine.url.database, pristine)
+    seed_file.write_text(json.dumps({"db_url": args.db_url, "seeded": seeded.to_dict()}))
+    print(f"seeded {args.scale}: {seeded.users} users, {seeded.questions} questions, "
+          f"{seeded.responses} responses in {time.perf_counter() - start:.1f}s")
+    return seeded
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _run_case(case, seeded, iterations: int, warmup: int, loaded: List[int]) -> Dict[str, float]:
+    import random
+
+    from app.database import SessionLocal
+    from app.query_counter import assert_query_budget, query_scope
+    from benchmarks.cases import Context
+
+    # Per-case RNG: the same arguments in every run, whatever cases are filtered out
+    ctx = Context(seeded=seeded, rng=random.Random(zlib.crc32(case.name.encode()) ^ seeded.seed))
+    times: List[float] = []
+    queries: List[int] = []
+    rows: List[int] = []
+    for i in range(warmup + iterations):
+        db = SessionLocal()  # one session per call, like a request
+        try:
+            arg = case.setup(db, ctx, i) if case.setup else None
+            loaded[0] = 0
+            counted = (
+                assert_query_budget(case.budget, name=case.name) if case.budget is not None
+                else query_scope(case.name)
+            )
+            with counted as scope:
+                start = time.perf_counter()
+                case.run(db, ctx, arg)
+                elapsed = time.perf_counter() - start
+            if i >= warmup:
+                times.append(elapsed * 1000.0)
+                queries.append(scope.count)
+                rows.append(loaded[0])
+        finally:
+            db.close()
+
+    times.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(times, 0.50), 4),
+        "p95_ms": round(_percentile(times, 0.95), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "queries": round(statistics.fmean(queries), 3),
+        "rows_materialized": round(statistics.fmean(rows), 3),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, noise_ms: float) -> List[str]:
+    """Regressions of ``current`` against ``baseline``, one message each."""
+    regressions = []
+    for name, now in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            continue
+        growth = now["p95_ms"] - before["p95_ms"]
+        if growth > noise_ms and now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f}ms -> {now['p95_ms']:.2f}ms")
+        if now["queries"] > before["queries"]:
+            regressions.append(f"{name}: queries {before['queries']} -> {now['queries']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    _configure_env(args)
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from app.database import get_engine
+    from benchmarks.cases import CASES
+
+    engine = get_engine()
+    seeded = seed_or_reuse(engine, args)
+
+    # "Rows materialized" = ORM instances built from result rows
+    loaded = [0]
+
+    @event.listens_for(Session, "loaded_as_persistent")
+    def _count_loaded(session, instance):
+        loaded[0] += 1
+
+    results: Dict[str, dict] = {}
+    failed: List[str] = []
+    print(f"{'case':<58}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'rows':>9}")
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        try:
+            stats = _run_case(case, seeded, args.iterations, args.warmup, loaded)
+        except Exception as exc:
+            failed.append(case.name)
+            print(f"{case.name:<58}FAILED: {exc!r}"[:200])
+            continue
+        results[case.name] = stats
+        print(f"{case.name:<58}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+              f"{stats['queries']:>9g}{stats['rows_materialized']:>9g}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "scale": seeded.scale,
+            "seed": seeded.seed,
+            "dialect": engine.dialect.name,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+        },
+        "cases": results,
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"wrote {args.output}")
+
+    if failed:
+        print(f"{len(failed)} case(s) failed: {', '.join(failed)}")
+        return 1
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold, args.noise_ms)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# benchmarks/serialization.py
+"""
+Time list-endpoint serialization: ORM -> model -> dict vs. the fast paths.
+
+    python -m benchmarks.serialization --scale small --limit 500 --output benchmarks/results/serialization.json
+
+For each listing, one page (fresh session per call, like a request) is
+turned into JSON bytes three ways:
+
+  orm_dict     get_*_page -> Read.model_validate(obj).model_dump() per row -> json.dumps
+  orm_adapter  get_*_page -> schemas.dump_json_list(<Read>List, items)
+  core_json    app.serialization.*_page_json (Core rows -> pydantic_core.to_json)
+
+and the three outputs are checked to be the same JSON before timing. Uses the
+same seeded database as benchmarks.run (--reuse restores it instead of seeding).
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.run import DEFAULT_DB, _configure_env, _percentile, seed_or_reuse
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization", description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", default="tiny", help="tiny | small | full (default: tiny)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default=f"sqlite:///{DEFAULT_DB}")
+    parser.add_argument("--reuse", action="store_true", help="skip seeding: restore the SQLite file as seeded by the previous run")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="write results JSON here")
+    return parser.parse_args(argv)
+
+
+def _listings():
+    from app import schemas, serialization
+    from app.crud import assessment, assessment_type, option, question, user, user_group
+
+    # name -> (crud page function, Read schema, list adapter, Core JSON function)
+    return {
+        "assessment_types": (assessment_type.get_assessment_types_page, schemas.AssessmentTypeRead,
+                             schemas.AssessmentTypeReadList, serialization.assessment_types_page_json),
+        "user_groups": (user_group.get_user_groups_page, schemas.UserGroupRead,
+                        schemas.UserGroupReadList, serialization.user_groups_page_json),
+        "users": (user.get_users_page, schemas.UserRead,
+                  schemas.UserReadList, serialization.users_page_json),
+        "assessments": (assessment.get_assessments_page, schemas.AssessmentRead,
+                        schemas.AssessmentReadList, serialization.assessments_page_json),
+        "options": (option.get_options_page, schemas.OptionRead,
+                    schemas.OptionReadList, serialization.options_page_json),
+        "questions": (question.get_questions_page, schemas.QuestionRead,
+                      schemas.QuestionReadList, serialization.questions_page_json),
+    }
+
+
+def _paths(get_page, read_schema, adapter, page_json, limit: int) -> Dict[str, Callable]:
+    from app.schemas import dump_json_list
+
+    def orm_dict(db) -> bytes:
+        page = get_page(db, limit=limit)
+        items = [read_schema.model_validate(obj).model_dump() for obj in page.items]
+        return json.dumps({"items": items, "next_cursor": page.next_cursor}).encode()
+
+    def orm_adapter(db) -> bytes:
+        page = get_page(db, limit=limit)
+        return b'{"items":%s,"next_cursor":%s}' % (
+            dump_json_list(adapter, page.items), json.dumps(page.next_cursor).encode())
+
+    def core_json(db) -> bytes:
+        return page_json(db, limit=limit)
+
+    return {"orm_dict": orm_dict, "orm_adapter": orm_adapter, "core_json": core_json}
+
+
+def _time(path: Callable, iterations: int, warmup: int) -> Dict[str, float]:
+    from app.database import SessionLocal
+    from app.query_counter import query_scope
+
+    times: List[float] = []
+    queries: List[int] = []
+    for i in range(warmup + iterations):
+        db = SessionLocal()
+        try:
+            with query_scope("serialization") as scope:
+                start = time.perf_counter()
+                body = path(db)
+                elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+        if i >= warmup:
+            times.append(elapsed * 1000.0)
+            queries.append(scope.count)
+    times.sort()
+    return {
+        "p50_ms": round(_percentile(times, 0.50), 4),
+        "p95_ms": round(_percentile(times, 0.95), 4),
+        "queries": round(statistics.fmean(queries), 3),
+        "bytes": len(body),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    _configure_env(args)
+
+    from app.database import SessionLocal, get_engine
+
+    seeded = seed_or_reuse(get_engine(), args)
+
+    results: Dict[str, dict] = {}
+    mismatched: List[str] = []
+    print(f"{'listing':<18}{'path':<13}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'speedup':>9}")
+    for name, (get_page, read_schema, adapter, page_json) in _listings().items():
+        paths = _paths(get_page, read_schema, adapter, page_json, args.limit)
+
+        with SessionLocal() as db:
+            outputs = {path_name: json.loads(path(db)) for path_name, path in paths.items()}
+        if not all(out == outputs["orm_dict"] for out in outputs.values()):
+            mismatched.append(name)
+            print(f"{name:<18}outputs differ between paths")
+            continue
+
+        results[name] = {path_name: _time(path, args.iterations, args.warmup) for path_name, path in paths.items()}
+        baseline = results[name]["orm_dict"]["p50_ms"]
+        for path_name, stats in results[name].items():
+            speedup = baseline / stats["p50_ms"] if stats["p50_ms"] else 0.0
+            print(f"{name:<18}{path_name:<13}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                  f"{stats['queries']:>9g}{speedup:>8.1f}x")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps({
+            "meta": {"scale": seeded.scale, "seed": seeded.seed, "limit": args.limit, "iterations": args.iterations},
+            "listings": results,
+        }, indent=2) + "\n")
+        print(f"wrote {args.output}")
+
+    if mismatched:
+        print(f"{len(mismatched)} listing(s) serialized differently: {', '.join(mismatched)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Exercise the read-replica RoutingSession locally, with SQLite files standing
+in for the primary and the replicas.
+
+    python scripts/check_replica_routing.py
+
+Builds primary.db, "replicates" it into replica1.db and replica2.db with the
+SQLite backup API (and then stops, so later writes show up as replica lag),
+adds a replica URL that cannot connect, and checks which engine each
+statement lands on: reads round-robin over the healthy replicas, one replica
+per transaction, writes and write transactions go to the
+primary, a caller's reads stay on the primary for the read-your-writes
+window, the broken replica is skipped, and read-then-write paths (a resent
+submission, the active-pointer cache loaders) read the primary. Exits 1 on
+the first mismatch.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+WINDOW_SECONDS = 0.5
+
+
+def _check(label: str, ok: bool) -> None:
+    print(f"{'ok  ' if ok else 'FAIL'} {label}")
+    if not ok:
+        sys.exit(1)
+
+
+def main() -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="vils-replicas-"))
+    primary_db = workdir / "primary.db"
+    replica_dbs = [workdir / "replica1.db", workdir / "replica2.db"]
+    os.environ["DB_URL"] = f"sqlite:///{primary_db}"
+    os.environ["DB_REPLICA_URLS"] = ",".join(
+        [f"sqlite:///{path}" for path in replica_dbs] + [f"sqlite:///{workdir}/missing/replica.db"]
+    )
+    os.environ["DB_READ_YOUR_WRITES_SECONDS"] = str(WINDOW_SECONDS)
+
+    from sqlalchemy import event, insert
+
+    from app import models
+    from app.cache import active_cache
+    from app.crud import assessment, submission, user_group
+    from app.database import Base, SessionLocal, get_engine, get_replicas
+    from app.db_routing import primary_reads, set_routing_key
+    from app.schemas import AssessmentCreate, SubmissionCreate, UserGroupCreate
+
+    primary = get_engine()
+    Base.metadata.create_all(primary)
+    with primary.begin() as conn:
+        conn.execute(insert(models.AssessmentType), [{"id": 1, "name": "type"}])
+        conn.execute(insert(models.UserGroup), [{"id": 1, "name": "seeded", "assessment_type_id": 1}])
+        conn.execute(insert(models.User), [
+            {"id": 1, "username": "u1", "email": "u1@example.com", "hashed_password": "x", "group_id": 1}
+        ])
+        conn.execute(insert(models.Assessment), [{"id": 1, "title": "a", "type_id": 1, "version": 1, "is_active": False}])
+        conn.execute(insert(models.QuestionSet), [{"id": 1, "assessment_id": 1, "version": 1, "is_active": False}])
+    for replica_db in replica_dbs:
+        with sqlite3.connect(primary_db) as src, sqlite3.connect(replica_db) as dst:
+            src.backup(dst)
+
+    replicas = get_replicas()
+    replica1, replica2, broken = replicas.engines
+    hits: Counter = Counter()     # by role: primary / replica / broken
+    replicas_used: Counter = Counter()
+    for name, engine in (("primary", primary), ("replica", replica1), ("replica", replica2), ("broken", broken)):
+        event.listen(engine, "before_cursor_execute", lambda *args, name=name: hits.update([name]))
+    for name, engine in (("replica1", replica1), ("replica2", replica2)):
+        event.listen(engine, "before_cursor_execute", lambda *args, name=name: replicas_used.update([name]))
+
+    health = replicas.check_health()
+    _check("health check marks the unreachable replica down", list(health.values()) == [True, True, False])
+
+    def routed(fn) -> Counter:
+        hits.clear()
+        replicas_used.clear()
+        fn()
+        return +hits
+
+    with SessionLocal() as db:
+        _check("reads go to the healthy replicas",
+               routed(lambda: [user_group.get_user_group(db, 1) for _ in range(4)]) == Counter(replica=4))
+        _check("one transaction's reads stay on one replica", len(replicas_used) == 1)
+        first = next(iter(replicas_used))
+        db.commit()
+        routed(lambda: user_group.get_user_group(db, 1))
+        _check("the next transaction picks the next replica", set(replicas_used) == {"replica1", "replica2"} - {first})
+        db.expunge_all()
+        _check("SELECT ... FOR UPDATE goes to the primary",
+               routed(lambda: db.query(models.UserGroup).with_for_update().all()) == Counter(primary=1))
+        db.rollback()
+
+    with SessionLocal() as db:
+        set_routing_key(db, "user-1")
+        groups = []
+        created = routed(lambda: groups.append(
+            user_group.create_user_group(db, UserGroupCreate(name="new", assessment_type_id=1))
+        ))
+        _check("writes go to the primary", set(created) == {"primary"})
+        new_id = groups[0].id
+        _check("same session reads its write back from the primary",
+               routed(lambda: user_group.get_user_group(db, new_id)) == Counter(primary=1))
+
+    with SessionLocal() as db:
+        set_routing_key(db, "user-1")
+        _check("the writer's next session still reads the primary",
+               routed(lambda: user_group.get_user_group(db, new_id)) == Counter(primary=1))
+
+    with SessionLocal() as db:
+        set_routing_key(db, "user-2")
+        found = []
+        _check("other callers read the (lagging) replica",
+               routed(lambda: found.append(user_group.get_user_group(db, new_id))) == Counter(replica=1)
+               and found == [None])
+        with primary_reads(db):
+            _check("primary_reads() pins reads to the primary",
+                   routed(lambda: user_group.get_user_group(db, new_id)) == Counter(primary=1))
+
+    time.sleep(WINDOW_SECONDS)
+    with SessionLocal() as db:
+        set_routing_key(db, "user-1")
+        _check("after the window the writer reads the replica again",
+               routed(lambda: user_group.get_user_group(db, 1)) == Counter(replica=1))
+
+    with SessionLocal() as db:
+        def write_then_read():
+            group = user_group.get_user_group(db, 1)
+            group.name = "renamed"
+            db.flush()
+            db.expire_all()
+            user_group.get_user_group(db, 1)
+            db.rollback()
+        _check("reads inside a write transaction stay on the primary",
+               routed(write_then_read) == Counter(replica=1, primary=2))
+
+    with SessionLocal() as db:
+        sub = SubmissionCreate(user_id=1, question_set_id=1, responses=[])
+        first = submission.bulk_create_submissions(db, [sub], enqueue_scoring=False)
+    with SessionLocal() as db:
+        resent = submission.bulk_create_submissions(db, [sub], enqueue_scoring=False)
+        _check("a resent submission is a conflict, not an IntegrityError (pre-check on the primary)",
+               first[0].status == "created" and resent[0].status == "conflict")
+
+    with SessionLocal() as db:
+        created = assessment.create_assessment(db, AssessmentCreate(title="new", type_id=1))
+    with SessionLocal() as db:
+        _check("activating a just-created assessment finds it on the primary",
+               assessment.activate_assessment(db, created.id) is not None)
+    with SessionLocal() as db:
+        assessment.activate_assessment(db, 1)
+    with SessionLocal() as db:
+        active_cache.clear()
+        _check("the active-pointer loader reads the primary, not the lagging replica",
+               routed(lambda: assessment.get_active_assessment_by_type(db, 1)) == Counter(primary=2))
+
+    print(f"all checks passed ({workdir})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Measure how long importing the app's modules takes, in fresh interpreters.
+
+    python scripts/measure_import_time.py --runs 7 --top 10
+
+Each module is imported in its own subprocess with DB_URL (and the rest of
+the app settings) removed from the environment, so the numbers show the cost
+of the import alone and the run fails if an import still parses the settings,
+builds an engine or connects anywhere. Reports the median wall time per
+module and, from ``python -X importtime``, the packages that dominate it.
+Exits 1 if any import needed the settings or an engine.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_MODULES = [
+    "app.config",
+    "app.database",
+    "app.models",
+    "app.schemas",
+    "app.cache",
+    "app.password_verification",
+    "app.crud.user",
+    "app.crud.assessment",
+    "app.crud.question_set",
+    "app.crud.option_set",
+    "app.crud.submission",
+    "app.snapshots",
+    "app.exports",
+    "app.item_analysis",
+    "app.tasks",
+]
+
+# Settings fields are read from these; none may be needed just to import
+_SETTINGS_ENV = ("DB_URL", "DB_ASYNC", "DB_ASYNC_URL", "REDIS_URL", "CELERY_BROKER_URL", "CELERY_RESULT_BACKEND")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+config, database = sys.modules.get("app.config"), sys.modules.get("app.database")
+print(json.dumps({{
+    "seconds": elapsed,
+    "settings_parsed": config is not None and config._settings is not None,
+    "engine_built": database is not None and database._engine is not None,
+}}))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if k not in _SETTINGS_ENV}
+    env["PYTHONPATH"] = str(ROOT)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def _probe(module: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", _PROBE.format(module=module)]
+    # cwd outside the repo so a local .env can't quietly satisfy the settings
+    return subprocess.run(args, env=_env(), cwd=ROOT.parent, capture_output=True, text=True)
+
+
+def _top_packages(importtime_log: str, top: int) -> List[tuple]:
+    """Self time per top-level package from ``-X importtime`` output, slowest first."""
+    totals: Dict[str, int] = defaultdict(int)
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5, help="subprocesses per module (median is reported)")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest packages per module")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results, bad = {}, []
+    for module in args.modules:
+        samples = []
+        for _ in range(args.runs):
+            proc = _probe(module)
+            if proc.returncode != 0:
+                print(f"{module}: import failed\n{proc.stderr.strip()}", file=sys.stderr)
+                bad.append(module)
+                break
+            samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        if len(samples) < args.runs:
+            continue
+        result = {
+            "median_ms": round(statistics.median(s["seconds"] for s in samples) * 1000.0, 1),
+            "settings_parsed": any(s["settings_parsed"] for s in samples),
+            "engine_built": any(s["engine_built"] for s in samples),
+        }
+        if args.top:
+            result["top_packages_ms"] = {
+                name: round(us / 1000.0, 1) for name, us in _top_packages(_probe(module, True).stderr, args.top)
+            }
+        if result["settings_parsed"] or result["engine_built"]:
+            bad.append(module)
+        results[module] = result
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'module':<30}{'median ms':>10}  {'settings':<9}{'engine':<7}")
+        for module, result in results.items():
+            print(f"{module:<30}{result['median_ms']:>10.1f}  "
+                  f"{'PARSED' if result['settings_parsed'] else '-':<9}{'BUILT' if result['engine_built'] else '-':<7}")
+            for name, ms in result.get("top_packages_ms", {}).items():
+                print(f"    {name:<26}{ms:>10.1f}")
+
+    if bad:
+        print(f"{len(bad)} module(s) failed or touched settings/engine at import: {', '.join(bad)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())